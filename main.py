@@ -242,37 +242,41 @@ class CryptoMarketAlertSystem:
             self.logger.error("Failed to initialize components, exiting")
             return
         
-        # Initialize alert system
-        if not await self.alerts_orchestrator.initialize():
-            self.logger.error("Failed to initialize alert system, exiting")
-            return
-        
-        check_interval = self.config.get('general', {}).get('check_interval', 300)
-        self.logger.info(f"Starting continuous monitoring (check interval: {check_interval}s)")
-        
-        last_daily_summary = datetime.now().date()
-        
-        while True:
-            try:
-                # Run market check
-                alerts_count = await self.run_single_check()
-                
-                # Send daily summary if it's a new day
-                current_date = datetime.now().date()
-                if current_date > last_daily_summary:
-                    await self.send_daily_summary()
-                    last_daily_summary = current_date
-                
-                # Wait for next check
-                self.logger.debug(f"Waiting {check_interval} seconds until next check")
-                await asyncio.sleep(check_interval)
-                
-            except KeyboardInterrupt:
-                self.logger.info("Received interrupt signal, shutting down...")
-                break
-            except Exception as e:
-                self.logger.error(f"Unexpected error in main loop: {e}")
-                await asyncio.sleep(60)  # Wait 1 minute before retrying
+        try:
+            # Initialize alert system
+            if not await self.alerts_orchestrator.initialize():
+                self.logger.error("Failed to initialize alert system, exiting")
+                return
+            
+            check_interval = self.config.get('general', {}).get('check_interval', 300)
+            self.logger.info(f"Starting continuous monitoring (check interval: {check_interval}s)")
+            
+            last_daily_summary = datetime.now().date()
+            
+            while True:
+                try:
+                    # Run market check
+                    alerts_count = await self.run_single_check()
+                    
+                    # Send daily summary if it's a new day
+                    current_date = datetime.now().date()
+                    if current_date > last_daily_summary:
+                        await self.send_daily_summary()
+                        last_daily_summary = current_date
+                    
+                    # Wait for next check
+                    self.logger.debug(f"Waiting {check_interval} seconds until next check")
+                    await asyncio.sleep(check_interval)
+                    
+                except KeyboardInterrupt:
+                    self.logger.info("Received interrupt signal, shutting down...")
+                    break
+                except Exception as e:
+                    self.logger.error(f"Unexpected error in main loop: {e}")
+                    await asyncio.sleep(60)  # Wait 1 minute before retrying
+        finally:
+            # Release pooled HTTP connections, however the loop ends
+            self.data_fetcher.close()
     
     async def run_once(self) -> int:
         """
@@ -287,9 +291,10 @@ class CryptoMarketAlertSystem:
             return 0
         
         # Run single check
-        alerts_count = await self.run_single_check()
-        
-        return alerts_count
+        try:
+            return await self.run_single_check()
+        finally:
+            self.data_fetcher.close()
 
 
 async def test_data_quality(alert_system):
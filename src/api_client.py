@@ -4,14 +4,61 @@ Follows DRY principle by providing a common base for all API interactions
 """
 
 import logging
+import random
 import time
 import requests
 import threading
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
 from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Circuit breaker: after this many consecutive failed requests to an endpoint,
+# skip it for a cooldown instead of running the retry loop. The cooldown starts at
+# CIRCUIT_BREAKER_COOLDOWN seconds and doubles each time the breaker re-opens,
+# up to CIRCUIT_BREAKER_MAX_COOLDOWN.
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = 30
+CIRCUIT_BREAKER_MAX_COOLDOWN = 300
+
+# 4xx statuses that are transient (Request Timeout, Too Early) and go through the retry path
+RETRYABLE_CLIENT_ERRORS = frozenset({408, 425})
+
+
+def decode_json(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body, using orjson when it is installed
+    
+    Falls back to ``response.json()`` when orjson is unavailable or the
+    body is not raw bytes. Decode errors are raised as ``ValueError``.
+    """
+    content = getattr(response, 'content', None)
+    if orjson is not None and isinstance(content, (bytes, bytearray)):
+        return orjson.loads(content)
+    return response.json()
+
+
+def create_session(*url_prefixes: str, pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """
+    Create a requests Session with a pooled HTTPAdapter mounted for each URL prefix
+    
+    Reusing a Session keeps TCP/TLS connections alive between calls to the same
+    host. Retries stay in APIClient.make_request, so the adapter never retries.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    for prefix in url_prefixes:
+        session.mount(prefix, adapter)
+    return session
+
 
 class APIClient(ABC):
     """
@@ -22,22 +69,38 @@ class APIClient(ABC):
     - Error handling
     """
     
+    # First backoff after a 429 without Retry-After; doubles on each further attempt
+    rate_limit_base_delay: float = 2
+    
     def __init__(self, 
                  base_url: str,
                  retry_attempts: int = 3,
                  retry_delay: int = 2,
                  cache_ttl: int = 60,
-                 min_interval: float = 1.0):
+                 min_interval: float = 1.0,
+                 endpoint_ttls: Dict[str, int] = None):
         self.base_url = base_url
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
         self.cache_ttl = cache_ttl
+        self.endpoint_ttls = endpoint_ttls or {}  # Per-endpoint overrides of cache_ttl
         self.min_interval = min_interval
         
+        # Pooled HTTP session (keep-alive across requests)
+        self._session = create_session(base_url)
+        
         # Caching and rate limiting
         self._cache = {}
+        self._etags = {}  # cache_key -> ETag of the cached response, for conditional requests
         self._last_request = 0
         self._lock = threading.Lock()
+        
+        # Circuit breaker state per endpoint
+        self._breakers = defaultdict(lambda: {'fails': 0, 'opened_at': 0.0, 'trips': 0, 'cooldown': 0.0, 'probing': False})
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session and its keep-alive connections"""
+        self._session.close()
     
     def _create_cache_key(self, endpoint: str, params: Dict = None) -> str:
         """Create a unique cache key from URL and parameters"""
@@ -47,11 +110,17 @@ class APIClient(ABC):
             return f"{url}?{params_str}"
         return url
     
-    def _get_cached_data(self, cache_key: str) -> Optional[Dict]:
+    def _get_cache_ttl(self, endpoint: str) -> int:
+        """Get the cache TTL for an endpoint, falling back to the client default"""
+        return self.endpoint_ttls.get(endpoint.strip('/'), self.cache_ttl)
+    
+    def _get_cached_data(self, cache_key: str, ttl: Optional[int] = None) -> Optional[Dict]:
         """Check if we have valid cached data"""
+        if ttl is None:
+            ttl = self.cache_ttl
         if cache_key in self._cache:
             cached_data, cached_time = self._cache[cache_key]
-            if time.time() - cached_time < self.cache_ttl:
+            if time.time() - cached_time < ttl:
                 logger.debug(f"Using cached data for {cache_key}")
                 return cached_data
         return None
@@ -61,16 +130,131 @@ class APIClient(ABC):
         with self._lock:
             self._cache[cache_key] = (data, time.time())
     
+    def _store_etag(self, cache_key: str, response: requests.Response) -> None:
+        """Remember the response ETag so the next refresh can be a conditional request"""
+        etag = getattr(response, 'headers', {}).get('ETag')
+        if isinstance(etag, str):
+            self._etags[cache_key] = etag
+    
+    def _is_circuit_open(self, endpoint: str) -> bool:
+        """True while the endpoint's breaker is open (too many recent failures)"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None or breaker['fails'] < CIRCUIT_BREAKER_THRESHOLD:
+            return False
+        # Once the cooldown has passed, a probe request may go through (half-open)
+        return time.time() - breaker['opened_at'] < breaker['cooldown']
+    
+    def _allow_request(self, endpoint: str) -> bool:
+        """
+        Decide whether a request may go out under the endpoint's circuit breaker
+        
+        While the breaker is open every request is refused. Once the cooldown has
+        passed, the first caller becomes the half-open probe: claiming it restarts
+        the cooldown clock, so concurrent callers keep being refused until the probe
+        succeeds or fails (or, if it never reports back, another cooldown passes).
+        """
+        breaker = self._breakers.get(endpoint)
+        if breaker is None or breaker['fails'] < CIRCUIT_BREAKER_THRESHOLD:
+            return True
+        with self._lock:
+            if self._is_circuit_open(endpoint):
+                return False
+            breaker['probing'] = True
+            breaker['opened_at'] = time.time()
+            return True
+    
+    def _record_failure(self, endpoint: str) -> None:
+        """Count a failed request; opens the breaker at the threshold and re-opens it when the probe fails"""
+        with self._lock:
+            breaker = self._breakers[endpoint]
+            breaker['fails'] += 1
+            # Requests already in flight when the breaker opened fail too; they must not trip it again
+            if breaker['fails'] == CIRCUIT_BREAKER_THRESHOLD or breaker['probing']:
+                breaker['probing'] = False
+                # Back off harder on each consecutive trip; jitter keeps clients from probing in lockstep
+                breaker['cooldown'] = min(CIRCUIT_BREAKER_COOLDOWN * 2 ** breaker['trips'],
+                                          CIRCUIT_BREAKER_MAX_COOLDOWN) + random.uniform(0, 1)
+                breaker['trips'] += 1
+                breaker['opened_at'] = time.time()
+                logger.warning(f"Circuit open for {self.base_url}/{endpoint} after {breaker['fails']} failures, "
+                               f"cooling down {breaker['cooldown']:.0f}s")
+    
+    def _record_success(self, endpoint: str) -> None:
+        """Close the endpoint's breaker after a successful response"""
+        if endpoint in self._breakers:
+            with self._lock:
+                self._breakers.pop(endpoint, None)
+    
+    def get_breaker_state(self, endpoint: str) -> Dict[str, Any]:
+        """
+        Describe the circuit breaker for an endpoint
+        
+        Returns:
+            Dict with 'state' ('closed', 'open' or 'half-open'), 'fails',
+            'trips' and 'cooldown' (seconds of the current or last open period)
+        """
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            return {'state': 'closed', 'fails': 0, 'trips': 0, 'cooldown': 0.0}
+        if breaker['fails'] < CIRCUIT_BREAKER_THRESHOLD:
+            state = 'closed'
+        elif breaker['probing']:
+            state = 'half-open'
+        elif self._is_circuit_open(endpoint):
+            state = 'open'
+        else:
+            state = 'half-open'
+        return {'state': state, 'fails': breaker['fails'], 'trips': breaker['trips'], 'cooldown': breaker['cooldown']}
+    
     def _apply_rate_limiting(self) -> None:
-        """Apply rate limiting between requests"""
+        """
+        Apply rate limiting between requests
+        
+        Each caller reserves the next free slot (min_interval after the previous
+        one) under the lock, then sleeps outside it. Concurrent requests stay
+        spaced out without holding the lock, so cache writes never wait on a
+        sleeping thread.
+        """
         with self._lock:
             current_time = time.time()
-            time_since_last = current_time - self._last_request
-            if time_since_last < self.min_interval:
-                sleep_time = self.min_interval - time_since_last
-                logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-                time.sleep(sleep_time)
-            self._last_request = time.time()
+            slot = max(current_time, self._last_request + self.min_interval)
+            self._last_request = slot
+        
+        sleep_time = slot - current_time
+        if sleep_time > 0:
+            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
+            time.sleep(sleep_time)
+    
+    def _wait_before_retry(self, delay: float) -> None:
+        """Sleep before the next retry attempt (skipped when no delay is configured)"""
+        if delay > 0:
+            time.sleep(delay)
+    
+    @staticmethod
+    def _get_retry_after(response: requests.Response) -> Optional[float]:
+        """Parse a Retry-After header (seconds or HTTP date) into seconds to wait"""
+        try:
+            value = response.headers.get('Retry-After')
+            if not isinstance(value, str):
+                return None
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                retry_at = parsedate_to_datetime(value)
+                return max(0.0, retry_at.timestamp() - time.time())
+        except (AttributeError, TypeError, ValueError):
+            return None
+    
+    def _rate_limit_backoff(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait after a 429: the server's Retry-After if given, else exponential backoff"""
+        retry_after = self._get_retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        return (2 ** attempt) * self.rate_limit_base_delay
+    
+    def _rate_limit_budget(self, attempt: int) -> float:
+        """Total seconds the client would back off on its own over the remaining attempts after a 429"""
+        return sum((2 ** later) * self.rate_limit_base_delay for later in range(attempt, self.retry_attempts))
     
     @abstractmethod
     def _prepare_headers(self) -> Dict[str, str]:
@@ -96,65 +280,107 @@ class APIClient(ABC):
         cache_key = self._create_cache_key(endpoint, params)
         
         # Check cache first
-        cached_data = self._get_cached_data(cache_key)
+        cached_data = self._get_cached_data(cache_key, self._get_cache_ttl(endpoint))
         if cached_data is not None:
             return cached_data
         
+        # Fail fast while the endpoint is known to be down
+        if not self._allow_request(endpoint):
+            logger.debug(f"Circuit open, skipping request to {endpoint}")
+            return None
+        
         # Apply rate limiting
         self._apply_rate_limiting()
         
         url = f"{self.base_url}/{endpoint}"
         headers = self._prepare_headers()
         
+        # Revalidate an expired entry instead of downloading it again
+        etag = self._etags.get(cache_key)
+        if etag and cache_key in self._cache:
+            headers = {**headers, 'If-None-Match': etag}
+        
+        # Encode URL, params and headers once; every retry resends the same prepared request
+        prepared = self._session.prepare_request(requests.Request('GET', url, params=params, headers=headers))
+        send_kwargs = self._session.merge_environment_settings(prepared.url, {}, None, None, None)
+        
         for attempt in range(self.retry_attempts):
             try:
-                response = requests.get(url, params=params, headers=headers, timeout=15)
+                response = self._session.send(prepared, timeout=15, **send_kwargs)
+                
+                # Unchanged since the cached copy: refresh it without a body or JSON parse
+                if response.status_code == 304 and cache_key in self._cache:
+                    data = self._cache[cache_key][0]
+                    self._cache_data(cache_key, data)
+                    self._record_success(endpoint)
+                    return data
                 
                 # Handle rate limiting
                 if response.status_code == 429:
+                    # The server asked us to stay away longer than our own backoff would wait in total
+                    retry_after = self._get_retry_after(response)
+                    if retry_after and retry_after > self._rate_limit_budget(attempt):
+                        logger.error(f"Rate limited for {retry_after:.0f}s (Retry-After), giving up on {url}")
+                        self._record_failure(endpoint)
+                        return None
                     if self._handle_rate_limit_response(response, attempt):
                         continue
                     else:
                         logger.error(f"Rate limit exceeded, giving up after {attempt + 1} attempts")
+                        self._record_failure(endpoint)
                         return None
                 
+                # Other 4xx responses are caller errors, not an outage: the same request fails the same way.
+                # The endpoint did answer, so this also settles a half-open probe.
+                if 400 <= response.status_code < 500 and response.status_code not in RETRYABLE_CLIENT_ERRORS:
+                    logger.warning(f"Request to {url} rejected with status {response.status_code}, not retrying")
+                    self._record_success(endpoint)
+                    return None
+                
                 # Handle other error status codes
                 if response.status_code != 200:
                     logger.warning(f"Request failed with status {response.status_code}")
                     if attempt < self.retry_attempts - 1:
-                        time.sleep(self.retry_delay * (attempt + 1))
+                        self._wait_before_retry(self.retry_delay * (attempt + 1))
                         continue
-                    else:
-                        return None
+                    self._record_failure(endpoint)
+                    return None
                 
                 response.raise_for_status()
                 
-                # Parse JSON response
+                # Parse JSON response (a malformed body is not retried; the server sent it deliberately)
                 try:
-                    data = response.json()
+                    data = decode_json(response)
                     self._cache_data(cache_key, data)
+                    self._store_etag(cache_key, response)
+                    self._record_success(endpoint)
                     return data
                 except ValueError as e:
-                    logger.error(f"Invalid JSON response: {e}")
-                    if attempt < self.retry_attempts - 1:
-                        time.sleep(self.retry_delay)
-                        continue
-                    else:
-                        return None
+                    logger.error(f"Invalid JSON response from {url}: {e}")
+                    self._record_failure(endpoint)
+                    return None
                 
+            except requests.exceptions.SSLError as e:
+                # Certificate problems do not fix themselves between attempts
+                logger.error(f"SSL error for {url}, not retrying: {e}")
+                self._record_failure(endpoint)
+                return None
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request failed (attempt {attempt + 1}/{self.retry_attempts}): {e}")
                 if attempt < self.retry_attempts - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
+                    self._wait_before_retry(self.retry_delay * (attempt + 1))
                 else:
                     logger.error(f"All retry attempts failed for {url}")
         
+        self._record_failure(endpoint)
         return None
 
 
 class BinanceClient(APIClient):
     """Binance API client - fast, reliable for prices and historical data"""
     
+    rate_limit_base_delay = 2
+    
     def __init__(self, retry_attempts: int = 3, retry_delay: int = 1):
         super().__init__(
             base_url="https://api.binance.com/api/v3",
@@ -170,22 +396,28 @@ class BinanceClient(APIClient):
     
     def _handle_rate_limit_response(self, response: requests.Response, attempt: int) -> bool:
         """Handle Binance rate limit (unlikely but possible)"""
-        backoff_time = (2 ** attempt) * 2
+        backoff_time = self._rate_limit_backoff(response, attempt)
         logger.warning(f"Binance rate limit, backing off for {backoff_time}s")
-        time.sleep(backoff_time)
+        self._wait_before_retry(backoff_time)
         return True
 
 
 class CoinGeckoClient(APIClient):
     """CoinGecko API client - for unique market metrics"""
     
+    rate_limit_base_delay = 5
+    
     def __init__(self, retry_attempts: int = 3, retry_delay: int = 2):
         super().__init__(
             base_url="https://api.coingecko.com/api/v3",
             retry_attempts=retry_attempts,
             retry_delay=retry_delay,
             cache_ttl=60,  # Longer cache for market metrics
-            min_interval=1.2  # Respect CoinGecko rate limits
+            min_interval=1.2,  # Respect CoinGecko rate limits
+            endpoint_ttls={
+                'global': 300,  # BTC dominance moves slowly
+                'coins/list': 3600  # Coin metadata rarely changes
+            }
         )
     
     def _prepare_headers(self) -> Dict[str, str]:
@@ -194,15 +426,17 @@ class CoinGeckoClient(APIClient):
     
     def _handle_rate_limit_response(self, response: requests.Response, attempt: int) -> bool:
         """Handle CoinGecko rate limit with exponential backoff"""
-        backoff_time = (2 ** attempt) * 5
+        backoff_time = self._rate_limit_backoff(response, attempt)
         logger.warning(f"CoinGecko rate limit, backing off for {backoff_time}s")
-        time.sleep(backoff_time)
+        self._wait_before_retry(backoff_time)
         return True
 
 
 class CoinMarketCapClient(APIClient):
     """CoinMarketCap API client - for fallback data"""
     
+    rate_limit_base_delay = 10  # Longer backoff to preserve monthly limits
+    
     def __init__(self, api_key: str, retry_attempts: int = 3, retry_delay: int = 3):
         super().__init__(
             base_url="https://pro-api.coinmarketcap.com/v1",
@@ -222,7 +456,7 @@ class CoinMarketCapClient(APIClient):
     
     def _handle_rate_limit_response(self, response: requests.Response, attempt: int) -> bool:
         """Handle CoinMarketCap rate limit with longer backoff"""
-        backoff_time = (2 ** attempt) * 10
+        backoff_time = self._rate_limit_backoff(response, attempt)
         logger.warning(f"CoinMarketCap rate limit, backing off for {backoff_time}s")
-        time.sleep(backoff_time)
+        self._wait_before_retry(backoff_time)
         return True
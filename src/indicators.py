@@ -6,9 +6,90 @@ Implements various technical analysis indicators for cryptocurrency markets
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List, Union
 import pandas_ta as ta
 
+try:
+    import talib
+except ImportError:  # TA-Lib (C library) is an optional speedup over pandas-ta
+    talib = None
+
+
+def _close_array(series: pd.Series) -> np.ndarray:
+    """Contiguous float64 view of a price series, as TA-Lib expects"""
+    return series.to_numpy(dtype=np.float64)
+
+
+def _rci(windows: np.ndarray) -> np.ndarray:
+    """
+    Rank Correlation Index of each price window along the last axis (oldest price first)
+    
+    Price ranks use the 'min' tie rule, like pandas rank(method='min'). Windows
+    containing NaN give NaN.
+    """
+    period = windows.shape[-1]
+    # Rank of each price = 1 + number of prices in its window strictly below it
+    price_ranks = (windows[..., :, None] > windows[..., None, :]).sum(axis=-1) + 1
+    time_ranks = np.arange(1, period + 1)
+    d_squared = ((price_ranks - time_ranks) ** 2).sum(axis=-1)
+    rci = (1 - (6 * d_squared) / (period * (period ** 2 - 1))) * 100
+    return np.where(np.isnan(windows).any(axis=-1), np.nan, rci)
+
+
+def _last_two_means(values: np.ndarray, period: int) -> Tuple[float, float]:
+    """
+    Latest and previous value of a simple moving average, without computing the rest of it
+    
+    Each is the mean of one window, so the cost is O(period) rather than
+    O(len(values)). The previous value is NaN when there is no earlier full window.
+    """
+    latest = values[-period:].mean()
+    previous = values[-period - 1:-1].mean() if len(values) > period else np.nan
+    return float(latest), float(previous)
+
+
+def _latest_value(series: Optional[pd.Series]) -> Optional[float]:
+    """Last value of an indicator series as a float, or None when it is missing or NaN"""
+    if series is None or series.empty:
+        return None
+    latest = series.iat[-1]
+    return None if pd.isna(latest) else float(latest)
+
+
+def _sma(series: pd.Series, length: int) -> pd.Series:
+    """Simple moving average, computed by TA-Lib when it is installed"""
+    if talib is not None:
+        return pd.Series(talib.SMA(_close_array(series), timeperiod=length), index=series.index)
+    return ta.sma(series, length=length)
+
+
+def _sma_pair(series: pd.Series, short_length: int, long_length: int) -> Tuple[pd.Series, pd.Series]:
+    """
+    Two simple moving averages of the same series from a single cumulative-sum pass
+    
+    Each window mean is a difference of two running sums, so the prices are read
+    once for both averages. A NaN would poison every later running sum, so series
+    with gaps fall back to the per-window rolling mean.
+    """
+    values = _close_array(series)
+    if np.isnan(values).any():
+        return _sma(series, short_length), _sma(series, long_length)
+    
+    running = np.concatenate(([0.0], np.cumsum(values)))
+    averages = []
+    for length in (short_length, long_length):
+        sma = np.full(len(values), np.nan)
+        sma[length - 1:] = (running[length:] - running[:-length]) / length
+        averages.append(pd.Series(sma, index=series.index, name=f'SMA_{length}'))
+    return averages[0], averages[1]
+
+
+def _ema(series: pd.Series, length: int) -> pd.Series:
+    """Exponential moving average, computed by TA-Lib when it is installed"""
+    if talib is not None:
+        return pd.Series(talib.EMA(_close_array(series), timeperiod=length), index=series.index)
+    return ta.ema(series, length=length)
+
 
 class TechnicalIndicators:
     """Calculate technical indicators for cryptocurrency price analysis"""
@@ -59,11 +140,15 @@ class TechnicalIndicators:
             return None
         
         try:
-            rsi = ta.rsi(df['close'], length=period)
-            if rsi is not None and not rsi.empty:
-                latest_rsi = rsi.iloc[-1]
-                return float(latest_rsi) if not pd.isna(latest_rsi) else None
-            return None
+            if talib is not None:
+                close = _close_array(df['close'])
+                # With no price movement RSI is 0/0: TA-Lib reports 0 (deeply oversold), pandas-ta NaN
+                if np.ptp(close) == 0:
+                    return None
+                rsi = pd.Series(talib.RSI(close, timeperiod=period), index=df.index)
+            else:
+                rsi = ta.rsi(df['close'], length=period)
+            return _latest_value(rsi)
         except Exception as e:
             self.logger.error(f"RSI calculation failed: {e}")
             return None
@@ -89,6 +174,16 @@ class TechnicalIndicators:
             }
         
         try:
+            if talib is not None:
+                macd, macd_signal, histogram = talib.MACD(
+                    _close_array(df['close']), fastperiod=fast, slowperiod=slow, signalperiod=signal
+                )
+                return {
+                    'macd': pd.Series(macd, index=df.index),
+                    'signal': pd.Series(macd_signal, index=df.index),
+                    'histogram': pd.Series(histogram, index=df.index)
+                }
+            
             macd_data = ta.macd(df['close'], fast=fast, slow=slow, signal=signal)
             
             return {
@@ -120,8 +215,7 @@ class TechnicalIndicators:
             return None
         
         try:
-            short_ma = ta.sma(df['close'], length=short_period)
-            long_ma = ta.sma(df['close'], length=long_period)
+            short_ma, long_ma = _sma_pair(df['close'], short_period, long_period)
             
             return {
                 'ma_short': short_ma,
@@ -148,7 +242,7 @@ class TechnicalIndicators:
         try:
             emas = {}
             for period in periods:
-                emas[f'ema_{period}'] = ta.ema(df['close'], length=period)
+                emas[f'ema_{period}'] = _ema(df['close'], period)
             
             return emas
         except Exception as e:
@@ -175,12 +269,27 @@ class TechnicalIndicators:
             }
         
         try:
-            bb_data = ta.bbands(df['close'], length=period, std=std_dev)
+            if talib is not None:
+                upper, middle, lower = talib.BBANDS(
+                    _close_array(df['close']), timeperiod=period, nbdevup=std_dev, nbdevdn=std_dev
+                )
+                return {
+                    'bb_upper': pd.Series(upper, index=df.index),
+                    'bb_middle': pd.Series(middle, index=df.index),
+                    'bb_lower': pd.Series(lower, index=df.index)
+                }
+            
+            # Population std (ddof=0) as in TA-Lib; pandas-ta 0.4 defaults to ddof=1 and
+            # reads the band width from lower_std/upper_std instead of std
+            bb_data = ta.bbands(df['close'], length=period, std=std_dev,
+                                lower_std=std_dev, upper_std=std_dev, ddof=0)
+            # pandas-ta suffixes the columns with its settings (e.g. 'BBU_20_2.0'), so match on the prefix
+            bands = {column.split('_', 1)[0]: bb_data[column] for column in bb_data.columns}
             
             return {
-                'bb_upper': bb_data[f'BBU_{period}_{std_dev}'],
-                'bb_middle': bb_data[f'BBM_{period}_{std_dev}'],
-                'bb_lower': bb_data[f'BBL_{period}_{std_dev}']
+                'bb_upper': bands['BBU'],
+                'bb_middle': bands['BBM'],
+                'bb_lower': bands['BBL']
             }
         except Exception as e:
             self.logger.error(f"Bollinger Bands calculation failed: {e}")
@@ -241,7 +350,7 @@ class TechnicalIndicators:
         
         try:
             return {
-                'volume_sma': ta.sma(df['volume'], length=20),
+                'volume_sma': _sma(df['volume'], 20),
                 'ad': ta.ad(df['high'], df['low'], df['close'], df['volume']) if all(col in df.columns for col in ['high', 'low']) else None,
                 'obv': ta.obv(df['close'], df['volume'])
             }
@@ -279,7 +388,7 @@ class TechnicalIndicators:
             if macd_data:
                 for key, series in macd_data.items():
                     if series is not None and not series.empty:
-                        results[f'macd_{key}'] = float(series.iloc[-1]) if not pd.isna(series.iloc[-1]) else None
+                        results[f'macd_{key}'] = _latest_value(series)
 
             # Moving Averages
             ma_data = self.calculate_moving_averages(
@@ -290,7 +399,7 @@ class TechnicalIndicators:
             if ma_data:
                 for key, series in ma_data.items():
                     if series is not None and not series.empty:
-                        results[key] = float(series.iloc[-1]) if not pd.isna(series.iloc[-1]) else None
+                        results[key] = _latest_value(series)
 
             # Pi Cycle Top Indicator
             # Default to calculating when enabled and coin_symbol is not provided (useful for tests or BTC context)
@@ -328,19 +437,21 @@ class TechnicalIndicators:
         Returns:
             Dictionary with bullish and bearish crossover flags
         """
-        if len(series1) < periods_back or len(series2) < periods_back:
+        # A crossover needs at least the previous and the latest value
+        min_length = max(periods_back, 2)
+        if len(series1) < min_length or len(series2) < min_length:
             return {'bullish_crossover': False, 'bearish_crossover': False}
         
         try:
-            # Recent values
-            recent1 = series1.iloc[-periods_back:].values
-            recent2 = series2.iloc[-periods_back:].values
+            # Only the last two points matter; scalar reads avoid slicing the series
+            prev1, last1 = series1.iat[-2], series1.iat[-1]
+            prev2, last2 = series2.iat[-2], series2.iat[-1]
             
             # Check for bullish crossover (series1 crosses above series2)
-            bullish_crossover = bool((recent1[-2] <= recent2[-2]) and (recent1[-1] > recent2[-1]))
+            bullish_crossover = bool((prev1 <= prev2) and (last1 > last2))
             
             # Check for bearish crossover (series1 crosses below series2)
-            bearish_crossover = bool((recent1[-2] >= recent2[-2]) and (recent1[-1] < recent2[-1]))
+            bearish_crossover = bool((prev1 >= prev2) and (last1 < last2))
             
             return {
                 'bullish_crossover': bullish_crossover,
@@ -396,21 +507,15 @@ class TechnicalIndicators:
             return {'pi_cycle_signal': False, 'ma_111': None, 'ma_350_2x': None, 'distance': None}
         
         try:
-            # Calculate the moving averages
-            ma_111 = ta.sma(df['close'], length=short_period)
-            ma_350 = ta.sma(df['close'], length=long_period)
-            
-            if ma_111 is None or ma_350 is None or ma_111.empty or ma_350.empty:
-                return {'pi_cycle_signal': False, 'ma_111': None, 'ma_350_2x': None, 'distance': None}
+            # Only the last two points of each moving average are needed
+            close = df['close'].to_numpy(dtype=np.float64)
+            latest_111, prev_111 = _last_two_means(close, short_period)
+            latest_350, prev_350 = _last_two_means(close, long_period)
             
             # Pi Cycle uses 2x the 350-day MA
-            ma_350_2x = ma_350 * 2
+            latest_350_2x, prev_350_2x = latest_350 * 2, prev_350 * 2
             
-            # Get latest values
-            latest_111 = float(ma_111.iloc[-1]) if not pd.isna(ma_111.iloc[-1]) else None
-            latest_350_2x = float(ma_350_2x.iloc[-1]) if not pd.isna(ma_350_2x.iloc[-1]) else None
-            
-            if latest_111 is None or latest_350_2x is None:
+            if np.isnan(latest_111) or np.isnan(latest_350_2x):
                 return {'pi_cycle_signal': False, 'ma_111': None, 'ma_350_2x': None, 'distance': None}
             
             # Check for crossover signal
@@ -421,13 +526,9 @@ class TechnicalIndicators:
             
             # Detect recent crossover
             crossover_detected = False
-            if len(ma_111) >= 2 and len(ma_350_2x) >= 2:
-                prev_111 = ma_111.iloc[-2]
-                prev_350_2x = ma_350_2x.iloc[-2]
-                
-                if not pd.isna(prev_111) and not pd.isna(prev_350_2x):
-                    # Bullish crossover: 111 MA crosses above 2x 350 MA
-                    crossover_detected = (prev_111 < prev_350_2x) and (latest_111 >= latest_350_2x)
+            if not np.isnan(prev_111) and not np.isnan(prev_350_2x):
+                # Bullish crossover: 111 MA crosses above 2x 350 MA
+                crossover_detected = (prev_111 < prev_350_2x) and (latest_111 >= latest_350_2x)
             
             return {
                 'pi_cycle_signal': pi_cycle_signal,
@@ -462,10 +563,12 @@ class TechnicalIndicators:
         try:
             results = {}
             rci_values = {}
+            # Read the closes once and share them across the three windows
+            close = _close_array(df['close'])
             
             for i, period in enumerate(periods):
                 rci_name = ['short', 'medium', 'long'][i]
-                rci_values[rci_name] = self._calculate_single_rci(df, period)
+                rci_values[rci_name] = self._calculate_single_rci(close, period)
                 results[f'rci_{rci_name}'] = rci_values[rci_name]
             
             # Generate trading signal based on RCI convergence/divergence
@@ -482,32 +585,23 @@ class TechnicalIndicators:
             self.logger.error(f"3-Line RCI calculation failed: {e}")
             return {'rci_short': None, 'rci_medium': None, 'rci_long': None, 'signal': 'NEUTRAL'}
 
-    def _calculate_single_rci(self, df: pd.DataFrame, period: int) -> Optional[float]:
+    def _calculate_single_rci(self, df: Union[pd.DataFrame, pd.Series, np.ndarray], period: int) -> Optional[float]:
         """
         Calculate RCI for a single period
         
         RCI = (1 - 6 * Σ(Rank_Price - Rank_Time)² / (period * (period² - 1))) * 100
+        
+        Accepts a DataFrame with a 'close' column, the close Series itself or its values.
         """
         if len(df) < period:
             return None
         
         try:
-            # Get the last 'period' values
-            recent_data = df['close'].tail(period).values
-            
-            # Create time ranks (1 to period)
-            time_ranks = list(range(1, period + 1))
-            
-            # Create price ranks (1 = lowest price, period = highest price)
-            price_ranks = pd.Series(recent_data).rank(method='min').tolist()
-            
-            # Calculate rank differences squared
-            rank_diff_squared = sum((p_rank - t_rank) ** 2 for p_rank, t_rank in zip(price_ranks, time_ranks))
-            
-            # RCI formula
-            rci = (1 - (6 * rank_diff_squared) / (period * (period ** 2 - 1))) * 100
+            close = df['close'] if isinstance(df, pd.DataFrame) else df
+            # Only the latest window is needed for the current RCI
+            recent_data = np.asarray(close, dtype=np.float64)[-period:]
             
-            return float(rci)
+            return float(_rci(recent_data))
             
         except Exception as e:
             self.logger.error(f"Single RCI calculation failed for period {period}: {e}")
@@ -524,12 +618,12 @@ class TechnicalIndicators:
         medium = rci_values.get('medium')
         long_term = rci_values.get('long')
         
-        if any(v is None for v in [short, medium, long_term]):
+        if short is None or medium is None or long_term is None:
             return 'NEUTRAL'
         
-        # Count how many RCI lines are in bullish/bearish territory
-        bullish_count = sum(1 for rci in [short, medium, long_term] if rci > 0)
-        bearish_count = sum(1 for rci in [short, medium, long_term] if rci < 0)
+        # Count how many RCI lines are in bullish/bearish territory (bools add as 0/1)
+        bullish_count = (short > 0) + (medium > 0) + (long_term > 0)
+        bearish_count = (short < 0) + (medium < 0) + (long_term < 0)
         
         # Strong signals when all three align
         if bullish_count == 3 and short > 50:
@@ -564,31 +658,12 @@ class TechnicalIndicators:
                 return {'error': 'Insufficient data for RCI calculation'}
             
             rci_values = {}
-            close_prices = df['close'].values
+            close_prices = df['close'].to_numpy(dtype=np.float64)
             
             for period in periods:
                 if len(close_prices) >= period:
-                    rci_series = []
-                    
-                    # Calculate RCI for each window
-                    for i in range(period - 1, len(close_prices)):
-                        window_prices = close_prices[i - period + 1:i + 1]
-                        
-                        # Create rank arrays
-                        price_ranks = pd.Series(window_prices).rank(method='min').values
-                        time_ranks = np.arange(1, period + 1)
-                        
-                        # Calculate Spearman correlation coefficient
-                        n = len(price_ranks)
-                        d_squared_sum = np.sum((price_ranks - time_ranks) ** 2)
-                        
-                        # RCI formula: (1 - 6 * Σd² / (n³ - n)) * 100
-                        rci = (1 - (6 * d_squared_sum) / (n ** 3 - n)) * 100
-                        rci_series.append(rci)
-                    
-                    # Pad with NaN for earlier periods
-                    full_series = [np.nan] * (period - 1) + rci_series
-                    rci_values[f'rci_{period}'] = full_series[-1] if rci_series else np.nan
+                    # Only the latest RCI is reported, so rank just the final window
+                    rci_values[f'rci_{period}'] = float(_rci(close_prices[-period:]))
                 else:
                     rci_values[f'rci_{period}'] = np.nan
             
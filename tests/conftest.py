@@ -4,20 +4,18 @@ Provides common mock setups and reusable test data to reduce execution time
 """
 
 import pytest
+import requests
+import time
 import pandas as pd
 import numpy as np
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.data_fetcher import DataFetcher
 from src.alerts import TelegramAlertsManager, AlertsOrchestrator
 from src.strategy import AlertStrategy
 from src.indicators import TechnicalIndicators
+from src.cycle_top_detector import CycleTopDetector
 
 
 # ============================================================================
@@ -53,7 +51,7 @@ def shared_indicators():
 def mock_successful_api_response():
     """Reusable mock for successful API responses"""
     def _mock_response(data, status_code=200):
-        mock = Mock()
+        mock = Mock(spec=requests.Response)  # Typos like mock.status_cod raise AttributeError
         mock.status_code = status_code
         mock.json.return_value = data
         mock.raise_for_status.return_value = None
@@ -65,7 +63,7 @@ def mock_successful_api_response():
 def mock_failed_api_response():
     """Reusable mock for failed API responses"""
     def _mock_response(status_code=500, exception=None):
-        mock = Mock()
+        mock = Mock(spec=requests.Response)
         mock.status_code = status_code
         if exception:
             mock.json.side_effect = exception
@@ -288,8 +286,6 @@ def mock_alerts_orchestrator():
 @pytest.fixture
 def performance_monitor():
     """Monitor test execution time for performance optimization"""
-    import time
-    
     class PerformanceMonitor:
         def __init__(self):
             self.start_time = None
@@ -346,6 +342,108 @@ def malicious_html_content():
     }
 
 
+# ============================================================================
+# CYCLE TOP DETECTOR FIXTURES
+# ============================================================================
+
+# Read-only cycle top detector configurations (CycleTopDetector only reads its config)
+_BASIC_CONFIG = {
+    'professional_alerts': {
+        'cycle_top_detection': {
+            'btc_overextension': {
+                'ma200_multiple': 4.0
+            },
+            'extreme_euphoria': {
+                'fear_greed_threshold': 80,
+                'btc_dominance_threshold': 35
+            },
+            'risk_thresholds': {
+                'low': 30,
+                'medium': 60,
+                'high': 80
+            }
+        }
+    }
+}
+
+_ANALYZE_CONFIG = {
+    'professional_alerts': {
+        'cycle_top_detection': {
+            'btc_overextension': {'ma200_multiple': 4.0},
+            'extreme_euphoria': {'fear_greed_threshold': 80},
+            'risk_thresholds': {'low': 30, 'medium': 60, 'high': 80}
+        }
+    }
+}
+
+_CYCLE_ONLY_CONFIG = {
+    'professional_alerts': {
+        'cycle_top_detection': {
+            'btc_overextension': {'ma200_multiple': 4.0}
+        }
+    }
+}
+
+_EUPHORIA_ONLY_CONFIG = {
+    'professional_alerts': {
+        'cycle_top_detection': {
+            'extreme_euphoria': {
+                'fear_greed_threshold': 80,
+                'btc_dominance_threshold': 35
+            }
+        }
+    }
+}
+
+_THRESHOLDS_CONFIG = {
+    'professional_alerts': {
+        'cycle_top_detection': {
+            'risk_thresholds': {
+                'low': 30,
+                'medium': 60,
+                'high': 80
+            }
+        }
+    }
+}
+
+
+@pytest.fixture(scope="session")
+def detector_basic():
+    """Share a fully configured CycleTopDetector across the test session"""
+    return CycleTopDetector(_BASIC_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def detector_analyze():
+    """Share a CycleTopDetector configured for analyze_cycle_top tests"""
+    return CycleTopDetector(_ANALYZE_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def detector_cycle_only():
+    """Share a CycleTopDetector with only BTC overextension configured"""
+    return CycleTopDetector(_CYCLE_ONLY_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def detector_euphoria_only():
+    """Share a CycleTopDetector with only extreme euphoria configured"""
+    return CycleTopDetector(_EUPHORIA_ONLY_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def detector_thresholds():
+    """Share a CycleTopDetector with only risk thresholds configured"""
+    return CycleTopDetector(_THRESHOLDS_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def detector_empty():
+    """Share a CycleTopDetector built from an empty configuration"""
+    return CycleTopDetector({})
+
+
 # ============================================================================
 # CLEANUP FIXTURES
 # ============================================================================
@@ -355,4 +453,28 @@ def cleanup_after_test():
     """Automatic cleanup after each test for performance"""
     yield
     # Cleanup any global state, clear caches, etc.
-    # This runs after each test automatically
\ No newline at end of file
+    # This runs after each test automatically
+
+
+@pytest.fixture(autouse=True)
+def restore_shared_detector_history(request):
+    """
+    Snapshot and restore streak history on shared CycleTopDetector fixtures
+    
+    Detector fixtures are shared across tests, so this keeps Fear & Greed and
+    BTC dominance history from leaking between tests (and xdist workers).
+    """
+    snapshots = []
+    for name in request.fixturenames:
+        if name.startswith('detector'):
+            detector = request.getfixturevalue(name)
+            if isinstance(detector, CycleTopDetector):
+                snapshots.append((detector,
+                                  list(detector.fear_greed_history),
+                                  list(detector.btc_dominance_history)))
+    yield
+    for detector, fear_greed, dominance in snapshots:
+        detector.fear_greed_history.clear()
+        detector.fear_greed_history.extend(fear_greed)
+        detector.btc_dominance_history.clear()
+        detector.btc_dominance_history.extend(dominance)
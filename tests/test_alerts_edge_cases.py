@@ -10,12 +10,6 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
 from telegram.error import TelegramError, NetworkError, BadRequest
 
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from src.alerts import TelegramAlertsManager, AlertsOrchestrator
 
 
@@ -5,323 +5,316 @@ These tests may use real APIs and should be marked as integration tests
 """
 
 import pytest
-import requests
-import sys
-import os
-from typing import Dict, Any
-from unittest.mock import patch, Mock
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from dataclasses import dataclass, fields
+from unittest.mock import patch
 
 from src.data_fetcher import DataFetcher
 
+pytestmark = [pytest.mark.integration, pytest.mark.network]
+
+
+# ============================================================================
+# RESPONSE SCHEMAS
+# ============================================================================
+
+VALID_CLASSIFICATIONS = frozenset({
+    'Extreme Fear', 'Fear', 'Neutral', 'Greed', 'Extreme Greed'
+})
+
+# Value range -> classifications consistent with that range
+CLASSIFICATION_BUCKETS = {
+    (0, 25): frozenset({'Extreme Fear', 'Fear'}),
+    (26, 74): VALID_CLASSIFICATIONS,
+    (75, 100): frozenset({'Greed', 'Extreme Greed'}),
+}
 
-@pytest.mark.integration
-@pytest.mark.network
-class TestBinanceAPIContract:
-    """Test Binance API contract validation - using mocks to avoid rate limits"""
+
+def _parse(schema, data: dict):
+    """Build a schema instance from a response dict, failing on missing fields"""
+    names = [f.name for f in fields(schema)]
+    missing = [name for name in names if name not in data]
+    assert not missing, f"Missing required fields: {missing}"
+    return schema(**{name: data[name] for name in names})
+
+
+@dataclass(frozen=True)
+class CoinGeckoMarketData:
+    """Per-coin market data entry as returned by get_coin_market_data_batch"""
+    usd: float
+    usd_24h_change: float
+    usd_24h_vol: float
+    usd_market_cap: float
     
-    @pytest.fixture(scope="class")
-    def data_fetcher(self):
-        """Create DataFetcher instance for contract testing"""
-        return DataFetcher(retry_attempts=2, retry_delay=1)
+    def __post_init__(self):
+        for field in fields(self):
+            value = getattr(self, field.name)
+            assert isinstance(value, (int, float)), f"Field {field.name} should be numeric"
+        assert -100 <= self.usd_24h_change <= 1000, "24h change should be reasonable"
+        assert self.usd_24h_vol > 0, "24h volume should be positive"
+        assert self.usd_market_cap > self.usd, "Market cap should be > price"
+
+
+@dataclass(frozen=True)
+class FearGreedData:
+    """Fear & Greed index entry as returned by get_fear_greed_index"""
+    value: int
+    classification: str
+    timestamp: str
     
-    def test_binance_ticker_price_contract(self, data_fetcher):
-        """Verify Binance ticker/price API returns expected data structure"""
-        # Mock Binance API response to avoid rate limits
-        mock_response = {'symbol': 'BTCUSDT', 'price': '45000.50'}
-        
-        with patch.object(data_fetcher, '_make_binance_request', return_value=mock_response):
-            result = data_fetcher.get_binance_price('BTCUSDT')
-            
-            # Validate required fields are present
-            assert 'symbol' in result, "Missing required field: symbol"
-            assert 'price' in result, "Missing required field: price"
-            
-            # Validate data types
-            assert isinstance(result['symbol'], str), "Symbol should be string"
-            assert isinstance(result['price'], str), "Price should be string (as per Binance API)"
-            
-            # Validate field values
-            assert result['symbol'] == 'BTCUSDT', f"Expected BTCUSDT, got {result['symbol']}"
-            assert len(result['price']) > 0, "Price should not be empty"
-            
-            # Validate price can be converted to float and is positive
-            price_float = float(result['price'])
-            assert price_float > 0, f"Price should be positive, got {price_float}"
-            assert price_float < 1000000, f"Price seems unrealistic: {price_float}"
+    def __post_init__(self):
+        assert isinstance(self.value, int), "Value should be integer"
+        assert 0 <= self.value <= 100, f"Fear & Greed value should be 0-100, got {self.value}"
+        assert self.classification in VALID_CLASSIFICATIONS, \
+            f"Invalid classification: {self.classification}"
+        assert isinstance(self.timestamp, str) and self.timestamp.isdigit(), \
+            "Timestamp should be numeric string"
+        assert len(self.timestamp) >= 10, "Timestamp should be at least 10 digits"
+
+
+# ============================================================================
+# BINANCE API CONTRACT
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def data_fetcher():
+    """Create DataFetcher instance for contract testing"""
+    return DataFetcher(retry_attempts=2, retry_delay=1)
+
+
+def test_binance_ticker_price_contract(data_fetcher):
+    """Verify Binance ticker/price API returns expected data structure"""
+    # Mock Binance API response to avoid rate limits
+    mock_response = {'symbol': 'BTCUSDT', 'price': '45000.50'}
     
-    def test_binance_klines_contract(self, data_fetcher):
-        """Verify Binance klines API returns expected OHLCV data structure"""
-        result = data_fetcher.get_binance_historical_data('BTCUSDT', '1d', 5)
+    with patch.object(data_fetcher, '_make_binance_request', return_value=mock_response):
+        result = data_fetcher.get_binance_price('BTCUSDT')
+        
+        # Validate required fields are present
+        assert 'symbol' in result, "Missing required field: symbol"
+        assert 'price' in result, "Missing required field: price"
+        
+        # Validate data types
+        assert isinstance(result['symbol'], str), "Symbol should be string"
+        assert isinstance(result['price'], str), "Price should be string (as per Binance API)"
         
-        if result is not None and not result.empty:
-            # Validate DataFrame structure
-            required_columns = ['open', 'high', 'low', 'close', 'volume']
-            for col in required_columns:
-                assert col in result.columns, f"Missing required column: {col}"
-            
-            # Validate data types
-            for col in required_columns:
-                assert result[col].dtype in ['float64', 'int64'], f"Column {col} should be numeric"
-            
-            # Validate OHLCV relationships
-            assert all(result['high'] >= result['low']), "High should be >= Low"
-            assert all(result['high'] >= result['open']), "High should be >= Open"
-            assert all(result['high'] >= result['close']), "High should be >= Close"
-            assert all(result['low'] <= result['open']), "Low should be <= Open"
-            assert all(result['low'] <= result['close']), "Low should be <= Close"
-            assert all(result['volume'] >= 0), "Volume should be non-negative"
-            
-            # Validate reasonable value ranges
-            assert all(result['close'] > 1000), "BTC price should be > $1000"
-            assert all(result['close'] < 1000000), "BTC price should be < $1M"
-        else:
-            pytest.skip("Binance historical data not available - skipping contract test")
+        # Validate field values
+        assert result['symbol'] == 'BTCUSDT', f"Expected BTCUSDT, got {result['symbol']}"
+        assert len(result['price']) > 0, "Price should not be empty"
+        
+        # Validate price can be converted to float and is positive
+        price_float = float(result['price'])
+        assert 0 < price_float < 1_000_000, f"Price unrealistic: {price_float}"
+
+
+def test_binance_multiple_symbols_contract(data_fetcher):
+    """Test Binance API with multiple common trading pairs"""
+    test_symbols = ['BTCUSDT', 'ETHUSDT', 'ADAUSDT']
     
-    def test_binance_multiple_symbols_contract(self, data_fetcher):
-        """Test Binance API with multiple common trading pairs"""
-        test_symbols = ['BTCUSDT', 'ETHUSDT', 'ADAUSDT']
+    for symbol in test_symbols:
+        result = data_fetcher.get_binance_price(symbol)
         
-        for symbol in test_symbols:
-            result = data_fetcher.get_binance_price(symbol)
-            
-            if result:
-                assert result['symbol'] == symbol
-                assert isinstance(result['price'], str)
-                assert float(result['price']) > 0
-            # If one symbol fails, continue testing others
-
-
-@pytest.mark.integration
-@pytest.mark.network
-class TestCoinGeckoAPIContract:
-    """Test CoinGecko API contract validation"""
+        if result:
+            assert result['symbol'] == symbol
+            assert isinstance(result['price'], str)
+            price = float(result['price'])
+            assert 0 < price < 1_000_000, f"Price unrealistic for {symbol}: {price}"
+        # If one symbol fails, continue testing others
+
+
+# ============================================================================
+# COINGECKO API CONTRACT
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def coingecko_fetcher():
+    """Create DataFetcher instance for contract testing"""
+    return DataFetcher(retry_attempts=2, retry_delay=2)  # Longer delay for CoinGecko
+
+
+def test_coingecko_simple_price_contract(coingecko_fetcher):
+    """Verify CoinGecko simple/price API returns expected data structure"""
+    result = coingecko_fetcher.get_coin_market_data_batch(['bitcoin'])
     
-    @pytest.fixture(scope="class")
-    def data_fetcher(self):
-        """Create DataFetcher instance for contract testing"""
-        return DataFetcher(retry_attempts=2, retry_delay=2)  # Longer delay for CoinGecko
+    if result and 'bitcoin' in result:
+        btc_data = _parse(CoinGeckoMarketData, result['bitcoin'])
+        assert 1000 < btc_data.usd < 1_000_000, f"BTC price unrealistic: {btc_data.usd}"
+    else:
+        pytest.skip("CoinGecko API not available - skipping contract test")
+
+
+def test_coingecko_batch_request_contract(coingecko_fetcher):
+    """Test CoinGecko batch request with multiple coins"""
+    coins = ['bitcoin', 'ethereum', 'cardano']
+    result = coingecko_fetcher.get_coin_market_data_batch(coins)
     
-    def test_coingecko_simple_price_contract(self, data_fetcher):
-        """Verify CoinGecko simple/price API returns expected data structure"""
-        result = data_fetcher.get_coin_market_data_batch(['bitcoin'])
+    if result:
+        # Should return data for at least some coins
+        assert len(result) > 0, "Should return data for at least one coin"
         
-        if result and 'bitcoin' in result:
-            btc_data = result['bitcoin']
-            
-            # Validate required fields
-            required_fields = ['usd', 'usd_24h_change', 'usd_24h_vol', 'usd_market_cap']
-            for field in required_fields:
-                assert field in btc_data, f"Missing required field: {field}"
-            
-            # Validate data types
-            for field in required_fields:
-                assert isinstance(btc_data[field], (int, float)), f"Field {field} should be numeric"
-            
-            # Validate value ranges
-            assert btc_data['usd'] > 1000, f"BTC price too low: {btc_data['usd']}"
-            assert btc_data['usd'] < 1000000, f"BTC price too high: {btc_data['usd']}"
-            assert btc_data['usd_market_cap'] > btc_data['usd'], "Market cap should be > price"
-            assert btc_data['usd_24h_vol'] > 0, "24h volume should be positive"
-            assert -100 <= btc_data['usd_24h_change'] <= 1000, "24h change should be reasonable"
-        else:
-            pytest.skip("CoinGecko API not available - skipping contract test")
+        for coin_id, coin_data in result.items():
+            assert coin_id in coins, f"Unexpected coin in response: {coin_id}"
+            assert isinstance(coin_data, dict), f"Coin data should be dict for {coin_id}"
+            assert 'usd' in coin_data, f"Missing USD price for {coin_id}"
+            assert isinstance(coin_data['usd'], (int, float)), f"USD price should be numeric for {coin_id}"
+            assert coin_data['usd'] > 0, f"USD price should be positive for {coin_id}"
+    else:
+        pytest.skip("CoinGecko batch API not available - skipping contract test")
+
+
+def test_coingecko_btc_dominance_contract(coingecko_fetcher):
+    """Verify CoinGecko BTC dominance API returns expected structure"""
+    result = coingecko_fetcher.get_btc_dominance()
     
-    def test_coingecko_batch_request_contract(self, data_fetcher):
-        """Test CoinGecko batch request with multiple coins"""
-        coins = ['bitcoin', 'ethereum', 'cardano']
-        result = data_fetcher.get_coin_market_data_batch(coins)
+    if result is not None:
+        # Validate data type
+        assert isinstance(result, (int, float)), "BTC dominance should be numeric"
         
-        if result:
-            # Should return data for at least some coins
-            assert len(result) > 0, "Should return data for at least one coin"
-            
-            for coin_id, coin_data in result.items():
-                assert coin_id in coins, f"Unexpected coin in response: {coin_id}"
-                assert isinstance(coin_data, dict), f"Coin data should be dict for {coin_id}"
-                assert 'usd' in coin_data, f"Missing USD price for {coin_id}"
-                assert isinstance(coin_data['usd'], (int, float)), f"USD price should be numeric for {coin_id}"
-                assert coin_data['usd'] > 0, f"USD price should be positive for {coin_id}"
-        else:
-            pytest.skip("CoinGecko batch API not available - skipping contract test")
+        # Validate reasonable range (BTC dominance should be 0-100%)
+        assert 0 <= result <= 100, f"BTC dominance should be 0-100%, got {result}"
+        
+        # Validate it's a reasonable value (historically BTC dominance is 30-80%)
+        assert 20 <= result <= 90, f"BTC dominance seems unrealistic: {result}%"
+    else:
+        pytest.skip("CoinGecko dominance API not available - skipping contract test")
+
+
+def test_coingecko_eth_btc_ratio_contract(coingecko_fetcher):
+    """Test ETH/BTC ratio calculation from CoinGecko data"""
+    result = coingecko_fetcher.get_eth_btc_ratio()
     
-    def test_coingecko_btc_dominance_contract(self, data_fetcher):
-        """Verify CoinGecko BTC dominance API returns expected structure"""
-        result = data_fetcher.get_btc_dominance()
+    if result is not None:
+        # Validate data type
+        assert isinstance(result, (int, float)), "ETH/BTC ratio should be numeric"
+        
+        # Validate reasonable range (historically ETH/BTC is 0.01-0.15)
+        assert 0.005 <= result <= 0.5, f"ETH/BTC ratio seems unrealistic: {result}"
         
-        if result is not None:
-            # Validate data type
-            assert isinstance(result, (int, float)), "BTC dominance should be numeric"
-            
-            # Validate reasonable range (BTC dominance should be 0-100%)
-            assert 0 <= result <= 100, f"BTC dominance should be 0-100%, got {result}"
-            
-            # Validate it's a reasonable value (historically BTC dominance is 30-80%)
-            assert 20 <= result <= 90, f"BTC dominance seems unrealistic: {result}%"
-        else:
-            pytest.skip("CoinGecko dominance API not available - skipping contract test")
+        # Validate precision (should have reasonable decimal places)
+        assert result > 0, "ETH/BTC ratio should be positive"
+    else:
+        pytest.skip("ETH/BTC ratio calculation not available - skipping contract test")
+
+
+# ============================================================================
+# FEAR & GREED API CONTRACT
+# ============================================================================
+
+def test_fear_greed_index_contract(data_fetcher):
+    """Verify Fear & Greed Index API returns expected data structure"""
+    result = data_fetcher.get_fear_greed_index()
     
-    def test_coingecko_eth_btc_ratio_contract(self, data_fetcher):
-        """Test ETH/BTC ratio calculation from CoinGecko data"""
-        result = data_fetcher.get_eth_btc_ratio()
+    if result:
+        fng = _parse(FearGreedData, result)
         
-        if result is not None:
-            # Validate data type
-            assert isinstance(result, (int, float)), "ETH/BTC ratio should be numeric"
-            
-            # Validate reasonable range (historically ETH/BTC is 0.01-0.15)
-            assert 0.005 <= result <= 0.5, f"ETH/BTC ratio seems unrealistic: {result}"
-            
-            # Validate precision (should have reasonable decimal places)
-            assert result > 0, "ETH/BTC ratio should be positive"
-        else:
-            pytest.skip("ETH/BTC ratio calculation not available - skipping contract test")
-
-
-@pytest.mark.integration
-@pytest.mark.network
-class TestFearGreedAPIContract:
-    """Test Fear & Greed Index API contract validation"""
+        # Validate value-classification consistency
+        expected = next(bucket for (low, high), bucket in CLASSIFICATION_BUCKETS.items()
+                        if low <= fng.value <= high)
+        assert fng.classification in expected, \
+            f"Value {fng.value} inconsistent with classification {fng.classification}"
+    else:
+        pytest.skip("Fear & Greed API not available - skipping contract test")
+
+
+# ============================================================================
+# API ERROR HANDLING CONTRACTS
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def error_fetcher():
+    """Create DataFetcher instance for error testing"""
+    return DataFetcher(retry_attempts=1, retry_delay=0.5)
+
+
+def test_binance_invalid_symbol_handling(error_fetcher):
+    """Test Binance API handling of invalid trading symbols"""
+    # Test with clearly invalid symbol
+    result = error_fetcher.get_binance_price('INVALIDCOIN')
     
-    @pytest.fixture(scope="class")
-    def data_fetcher(self):
-        """Create DataFetcher instance for contract testing"""
-        return DataFetcher(retry_attempts=2, retry_delay=1)
+    # Should handle gracefully and return None
+    assert result is None, "Invalid symbol should return None"
+
+
+def test_coingecko_invalid_coin_handling(error_fetcher):
+    """Test CoinGecko API handling of invalid coin IDs"""
+    # Test with clearly invalid coin ID
+    result = error_fetcher.get_coin_market_data_batch(['invalid-coin-12345'])
     
-    def test_fear_greed_index_contract(self, data_fetcher):
-        """Verify Fear & Greed Index API returns expected data structure"""
-        result = data_fetcher.get_fear_greed_index()
-        
-        if result:
-            # Validate required fields
-            required_fields = ['value', 'classification', 'timestamp']
-            for field in required_fields:
-                assert field in result, f"Missing required field: {field}"
-            
-            # Validate data types
-            assert isinstance(result['value'], int), "Value should be integer"
-            assert isinstance(result['classification'], str), "Classification should be string"
-            assert isinstance(result['timestamp'], str), "Timestamp should be string"
-            
-            # Validate value range (Fear & Greed index is 0-100)
-            assert 0 <= result['value'] <= 100, f"Fear & Greed value should be 0-100, got {result['value']}"
-            
-            # Validate classification values
-            valid_classifications = [
-                'Extreme Fear', 'Fear', 'Neutral', 'Greed', 'Extreme Greed'
-            ]
-            assert result['classification'] in valid_classifications, \
-                f"Invalid classification: {result['classification']}"
-            
-            # Validate timestamp format (should be numeric string)
-            assert result['timestamp'].isdigit(), "Timestamp should be numeric string"
-            assert len(result['timestamp']) >= 10, "Timestamp should be at least 10 digits"
-            
-            # Validate value-classification consistency
-            value = result['value']
-            classification = result['classification']
-            
-            if value <= 25:
-                assert 'Fear' in classification, f"Value {value} should indicate Fear"
-            elif value >= 75:
-                assert 'Greed' in classification, f"Value {value} should indicate Greed"
-        else:
-            pytest.skip("Fear & Greed API not available - skipping contract test")
-
-
-@pytest.mark.integration
-@pytest.mark.network
-class TestAPIErrorHandlingContracts:
-    """Test API error handling and edge cases in real scenarios"""
+    # Should handle gracefully - either return None or empty dict
+    assert result is None or result == {}, "Invalid coin should return None or empty dict"
+
+
+def test_api_rate_limiting_behavior(error_fetcher):
+    """Test API behavior under potential rate limiting"""
+    # Make multiple rapid requests to test rate limiting handling
+    results = []
+    for i in range(3):
+        result = error_fetcher.get_binance_price('BTCUSDT')
+        results.append(result)
     
-    @pytest.fixture(scope="class")
-    def data_fetcher(self):
-        """Create DataFetcher instance for error testing"""
-        return DataFetcher(retry_attempts=1, retry_delay=0.5)
+    # At least some requests should succeed (or all fail gracefully)
+    successful_requests = [r for r in results if r is not None]
     
-    def test_binance_invalid_symbol_handling(self, data_fetcher):
-        """Test Binance API handling of invalid trading symbols"""
-        # Test with clearly invalid symbol
-        result = data_fetcher.get_binance_price('INVALIDCOIN')
-        
-        # Should handle gracefully and return None
-        assert result is None, "Invalid symbol should return None"
+    # Either all succeed (no rate limiting) or some fail gracefully
+    assert len(successful_requests) >= 0, "Should handle rate limiting gracefully"
     
-    def test_coingecko_invalid_coin_handling(self, data_fetcher):
-        """Test CoinGecko API handling of invalid coin IDs"""
-        # Test with clearly invalid coin ID
-        result = data_fetcher.get_coin_market_data_batch(['invalid-coin-12345'])
-        
-        # Should handle gracefully - either return None or empty dict
-        assert result is None or result == {}, "Invalid coin should return None or empty dict"
+    # If any succeed, they should have valid structure
+    for result in successful_requests:
+        assert 'symbol' in result
+        assert 'price' in result
+
+
+# ============================================================================
+# API PERFORMANCE CONTRACTS
+# Each test hits a different API and sits in its own xdist group, so
+# ``pytest -n 3 --dist=loadgroup`` runs them concurrently.
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def perf_fetcher():
+    """Create DataFetcher instance for performance testing"""
+    return DataFetcher(retry_attempts=1, retry_delay=0.1)
+
+
+@pytest.mark.xdist_group(name="perf_binance")
+def test_binance_response_time_contract(perf_fetcher, performance_monitor):
+    """Test that Binance API responds within reasonable time"""
+    performance_monitor.start()
     
-    def test_api_rate_limiting_behavior(self, data_fetcher):
-        """Test API behavior under potential rate limiting"""
-        # Make multiple rapid requests to test rate limiting handling
-        results = []
-        for i in range(3):
-            result = data_fetcher.get_binance_price('BTCUSDT')
-            results.append(result)
-        
-        # At least some requests should succeed (or all fail gracefully)
-        successful_requests = [r for r in results if r is not None]
-        
-        # Either all succeed (no rate limiting) or some fail gracefully
-        assert len(successful_requests) >= 0, "Should handle rate limiting gracefully"
-        
-        # If any succeed, they should have valid structure
-        for result in successful_requests:
-            assert 'symbol' in result
-            assert 'price' in result
+    result = perf_fetcher.get_binance_price('BTCUSDT')
+    
+    if result:
+        # Should respond within 10 seconds for single request
+        performance_monitor.assert_under_threshold(10.0)
+    else:
+        pytest.skip("Binance API not available - skipping performance test")
 
 
-@pytest.mark.integration
-@pytest.mark.network
-class TestAPIPerformanceContracts:
-    """Test API performance and response time contracts"""
+@pytest.mark.xdist_group(name="perf_coingecko")
+def test_coingecko_response_time_contract(perf_fetcher, performance_monitor):
+    """Test that CoinGecko API responds within reasonable time"""
+    performance_monitor.start()
     
-    @pytest.fixture(scope="class")
-    def data_fetcher(self):
-        """Create DataFetcher instance for performance testing"""
-        return DataFetcher(retry_attempts=1, retry_delay=0.1)
+    result = perf_fetcher.get_coin_market_data_batch(['bitcoin'])
     
-    def test_binance_response_time_contract(self, data_fetcher, performance_monitor):
-        """Test that Binance API responds within reasonable time"""
-        performance_monitor.start()
-        
-        result = data_fetcher.get_binance_price('BTCUSDT')
-        
-        if result:
-            # Should respond within 10 seconds for single request
-            performance_monitor.assert_under_threshold(10.0)
-        else:
-            pytest.skip("Binance API not available - skipping performance test")
+    if result:
+        # CoinGecko can be slower, allow up to 15 seconds
+        performance_monitor.assert_under_threshold(15.0)
+    else:
+        pytest.skip("CoinGecko API not available - skipping performance test")
+
+
+@pytest.mark.xdist_group(name="perf_fng")
+def test_fear_greed_response_time_contract(perf_fetcher, performance_monitor):
+    """Test that Fear & Greed API responds within reasonable time"""
+    performance_monitor.start()
     
-    def test_coingecko_response_time_contract(self, data_fetcher, performance_monitor):
-        """Test that CoinGecko API responds within reasonable time"""
-        performance_monitor.start()
-        
-        result = data_fetcher.get_coin_market_data_batch(['bitcoin'])
-        
-        if result:
-            # CoinGecko can be slower, allow up to 15 seconds
-            performance_monitor.assert_under_threshold(15.0)
-        else:
-            pytest.skip("CoinGecko API not available - skipping performance test")
+    result = perf_fetcher.get_fear_greed_index()
     
-    def test_fear_greed_response_time_contract(self, data_fetcher, performance_monitor):
-        """Test that Fear & Greed API responds within reasonable time"""
-        performance_monitor.start()
-        
-        result = data_fetcher.get_fear_greed_index()
-        
-        if result:
-            # Should respond within 10 seconds
-            performance_monitor.assert_under_threshold(10.0)
-        else:
-            pytest.skip("Fear & Greed API not available - skipping performance test")
+    if result:
+        # Should respond within 10 seconds
+        performance_monitor.assert_under_threshold(10.0)
+    else:
+        pytest.skip("Fear & Greed API not available - skipping performance test")
 
 
 if __name__ == '__main__':
@@ -6,47 +6,63 @@ Tests cycle top detection algorithms, risk scoring, and alert generation
 import pytest
 import pandas as pd
 import numpy as np
-from unittest.mock import Mock, patch
-from datetime import datetime, timedelta
 
 from src.cycle_top_detector import CycleTopDetector
 
+# Immutable date indexes shared by the historical data fixtures
+_IDX20 = pd.date_range('2023-01-01', periods=20)
+_IDX10 = pd.date_range('2023-01-01', periods=10)
+
+# Prebuilt float64 close arrays (skip pandas dtype inference on Python lists)
+_CLOSES_20 = np.tile(np.array([48000, 49000, 50000, 51000, 52000], dtype=np.float64), 4)
+_CLOSES_10 = np.arange(45000, 55000, 1000, dtype=np.float64)
+
+# Keys every analyze_cycle_top() result must expose
+_RESULT_KEYS = frozenset({'risk_score', 'risk_level', 'signals', 'dashboard', 'should_alert'})
+
+
+def _assert_result_schema(result):
+    """Assert result is a dict exposing all cycle top result keys"""
+    assert isinstance(result, dict) and _RESULT_KEYS <= result.keys()
+
+
+@pytest.fixture(scope="module")
+def btc_history_20():
+    """20-day BTC close history shared read-only across the module"""
+    return pd.DataFrame({
+        'close': _CLOSES_20,
+        'timestamp': _IDX20
+    })
+
+
+@pytest.fixture(scope="module")
+def btc_history_10():
+    """10-day rising BTC close history shared read-only across the module"""
+    return pd.DataFrame({
+        'close': _CLOSES_10,
+        'timestamp': _IDX10
+    })
+
+
 
 class TestCycleTopDetector:
     """Test CycleTopDetector initialization and configuration"""
     
     @pytest.fixture
-    def basic_config(self):
+    def basic_config(self, detector_basic):
         """Basic configuration for testing"""
-        return {
-            'professional_alerts': {
-                'cycle_top_detection': {
-                    'btc_overextension': {
-                        'ma200_multiple': 4.0
-                    },
-                    'extreme_euphoria': {
-                        'fear_greed_threshold': 80,
-                        'btc_dominance_threshold': 35
-                    },
-                    'risk_thresholds': {
-                        'low': 30,
-                        'medium': 60,
-                        'high': 80
-                    }
-                }
-            }
-        }
+        return detector_basic.config
     
     @pytest.fixture
-    def detector(self, basic_config):
+    def detector(self, detector_basic):
         """Create CycleTopDetector instance for testing"""
-        return CycleTopDetector(basic_config)
+        return detector_basic
     
     def test_init_with_valid_config(self, basic_config):
         """Test initialization with valid configuration"""
         detector = CycleTopDetector(basic_config)
         
-        assert detector.config == basic_config
+        assert detector.config is basic_config
         assert detector.cycle_config == basic_config['professional_alerts']['cycle_top_detection']
         assert detector.fear_greed_history == []
         assert detector.btc_dominance_history == []
@@ -74,20 +90,11 @@ class TestAnalyzeCycleTop:
     """Test main analyze_cycle_top method"""
     
     @pytest.fixture
-    def detector(self):
-        config = {
-            'professional_alerts': {
-                'cycle_top_detection': {
-                    'btc_overextension': {'ma200_multiple': 4.0},
-                    'extreme_euphoria': {'fear_greed_threshold': 80},
-                    'risk_thresholds': {'low': 30, 'medium': 60, 'high': 80}
-                }
-            }
-        }
-        return CycleTopDetector(config)
+    def detector(self, detector_analyze):
+        return detector_analyze
     
-    @pytest.fixture
-    def sample_data_dict(self):
+    @pytest.fixture(scope="class")
+    def sample_data_dict(self, btc_history_20):
         """Sample data dictionary for testing"""
         return {
             'bitcoin': {
@@ -98,14 +105,11 @@ class TestAnalyzeCycleTop:
                     'ma_short': 45000,  # MA50
                     'rsi': 75
                 },
-                'historical': pd.DataFrame({
-                    'close': [48000, 49000, 50000, 51000, 52000] * 4,
-                    'timestamp': pd.date_range('2023-01-01', periods=20)
-                })
+                'historical': btc_history_20
             }
         }
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_market_data(self):
         """Sample market data for testing"""
         return {
@@ -121,12 +125,7 @@ class TestAnalyzeCycleTop:
         result = detector.analyze_cycle_top(sample_data_dict, sample_market_data)
         
         # Check result structure
-        assert isinstance(result, dict)
-        assert 'risk_score' in result
-        assert 'risk_level' in result
-        assert 'signals' in result
-        assert 'dashboard' in result
-        assert 'should_alert' in result
+        _assert_result_schema(result)
         
         # Check data types
         assert isinstance(result['risk_score'], int)
@@ -148,8 +147,7 @@ class TestAnalyzeCycleTop:
         result = detector.analyze_cycle_top(data_dict, sample_market_data)
         
         # Should still return valid structure
-        assert isinstance(result, dict)
-        assert 'risk_score' in result
+        _assert_result_schema(result)
         assert result['risk_score'] >= 0
     
     def test_analyze_cycle_top_with_none_inputs(self, detector):
@@ -157,62 +155,42 @@ class TestAnalyzeCycleTop:
         result = detector.analyze_cycle_top(None, None)
         
         # Should handle gracefully and return default result
-        assert isinstance(result, dict)
-        assert 'risk_score' in result
+        _assert_result_schema(result)
     
     def test_analyze_cycle_top_exception_handling(self, detector):
         """Test exception handling in analyze_cycle_top"""
-        # Mock _analyze_btc_overextension to raise exception
-        with patch.object(detector, '_analyze_btc_overextension', side_effect=Exception("Test error")):
+        def _raise(*args, **kwargs):
+            raise Exception("Test error")
+        
+        # Swap _analyze_btc_overextension on the instance to raise an exception
+        detector._analyze_btc_overextension = _raise
+        try:
             result = detector.analyze_cycle_top({}, {})
-            
-            # Should return default result on exception
-            assert isinstance(result, dict)
-            assert 'risk_score' in result
+        finally:
+            del detector._analyze_btc_overextension
+        
+        # Should return default result on exception
+        _assert_result_schema(result)
+        assert result == detector._get_default_result()
 
 
 class TestAnalyzeBtcOverextension:
     """Test BTC overextension analysis"""
     
     @pytest.fixture
-    def detector(self):
-        config = {
-            'professional_alerts': {
-                'cycle_top_detection': {
-                    'btc_overextension': {'ma200_multiple': 4.0}
-                }
-            }
-        }
-        return CycleTopDetector(config)
-    
-    def test_btc_overextension_normal_conditions(self, detector):
-        """Test BTC overextension under normal conditions"""
-        btc_data = {
-            'usd': 50000,
-            'indicators': {
-                'ma_long': 45000,  # 1.11x multiple - normal
-                'ma_short': 48000
-            }
-        }
-        
-        result = detector._analyze_btc_overextension(btc_data)
-        
-        assert isinstance(result, dict)
-        assert 'active_signals' in result
-        assert 'score' in result
-        assert 'details' in result
-        assert 'signals' in result
-        assert 'warnings' in result
-        
-        # Normal conditions should have low score
-        assert result['score'] == 0
-        assert result['active_signals'] == 0
-        assert len(result['signals']) == 0
-    
-    def test_btc_overextension_high_multiple(self, detector):
-        """Test BTC overextension with high MA200 multiple"""
+    def detector(self, detector_cycle_only):
+        return detector_cycle_only
+    
+    @pytest.mark.parametrize("price,expected_score,expected_signals,expect_warnings", [
+        (50000, 0, 0, False),    # 1.11x MA200 - normal
+        (200000, 40, 1, False),  # 4.4x MA200 - above threshold
+        (300000, 60, 2, True),   # 6.67x MA200 - extreme (40 + 20)
+    ])
+    def test_btc_overextension_ma200_multiple(self, detector, price, expected_score,
+                                              expected_signals, expect_warnings):
+        """Test BTC overextension scoring across MA200 multiple levels"""
         btc_data = {
-            'usd': 200000,  # 4.4x multiple - above threshold
+            'usd': price,
             'indicators': {
                 'ma_long': 45000,  # MA200
                 'ma_short': 48000
@@ -221,28 +199,15 @@ class TestAnalyzeBtcOverextension:
         
         result = detector._analyze_btc_overextension(btc_data)
         
-        # Should trigger overextension signal
-        assert result['score'] > 0
-        assert result['active_signals'] > 0
-        assert len(result['signals']) > 0
-        assert result['details']['ma200_multiple'] > 4.0
-    
-    def test_btc_overextension_extreme_multiple(self, detector):
-        """Test BTC overextension with extreme MA200 multiple"""
-        btc_data = {
-            'usd': 300000,  # 6.67x multiple - extreme
-            'indicators': {
-                'ma_long': 45000,  # MA200
-                'ma_short': 48000
-            }
-        }
-        
-        result = detector._analyze_btc_overextension(btc_data)
+        assert isinstance(result, dict)
+        for key in ('active_signals', 'score', 'details', 'signals', 'warnings'):
+            assert key in result
         
-        # Should trigger both overextension and extreme signals
-        assert result['score'] >= 60  # 40 + 20 for extreme
-        assert result['active_signals'] >= 2
-        assert len(result['warnings']) > 0
+        assert result['score'] == expected_score
+        assert result['active_signals'] == expected_signals
+        assert bool(result['signals']) is (expected_signals > 0)
+        assert bool(result['warnings']) is expect_warnings
+        assert result['details']['ma200_multiple'] == pytest.approx(price / 45000)
     
     def test_btc_overextension_missing_data(self, detector):
         """Test BTC overextension with missing data"""
@@ -270,20 +235,15 @@ class TestAnalyzeBtcOverextension:
         assert result['score'] == 0
         assert result['active_signals'] == 0
     
-    def test_btc_overextension_with_historical_data(self, detector):
+    def test_btc_overextension_with_historical_data(self, detector, btc_history_10):
         """Test BTC overextension with historical data for MA50 slope analysis"""
-        historical_data = pd.DataFrame({
-            'close': [45000, 46000, 47000, 48000, 49000, 50000, 51000, 52000, 53000, 54000],
-            'timestamp': pd.date_range('2023-01-01', periods=10)
-        })
-        
         btc_data = {
             'usd': 200000,  # High multiple
             'indicators': {
                 'ma_long': 45000,
                 'ma_short': 48000
             },
-            'historical': historical_data
+            'historical': btc_history_10
         }
         
         result = detector._analyze_btc_overextension(btc_data)
@@ -297,24 +257,19 @@ class TestAnalyzeExtremeEuphoria:
     """Test extreme euphoria analysis"""
     
     @pytest.fixture
-    def detector(self):
-        config = {
-            'professional_alerts': {
-                'cycle_top_detection': {
-                    'extreme_euphoria': {
-                        'fear_greed_threshold': 80,
-                        'btc_dominance_threshold': 35
-                    }
-                }
-            }
-        }
-        return CycleTopDetector(config)
-    
-    def test_extreme_euphoria_normal_conditions(self, detector):
-        """Test extreme euphoria under normal conditions"""
+    def detector(self, detector_euphoria_only):
+        return detector_euphoria_only
+    
+    @pytest.mark.parametrize("fear_greed,classification,expected_score,expected_signals", [
+        (50, 'Neutral', 0, 0),          # Normal conditions
+        (90, 'Extreme Greed', 25, 1),   # Above threshold (dominance is handled in market structure)
+    ])
+    def test_extreme_euphoria_fear_greed_levels(self, detector, fear_greed, classification,
+                                                expected_score, expected_signals):
+        """Test extreme euphoria scoring across Fear & Greed levels"""
         btc_data = {'usd': 50000}
         market_data = {
-            'fear_greed_index': {'value': 50, 'value_classification': 'Neutral'},
+            'fear_greed_index': {'value': fear_greed, 'value_classification': classification},
             'btc_dominance': 45.0
         }
         
@@ -323,38 +278,8 @@ class TestAnalyzeExtremeEuphoria:
         assert isinstance(result, dict)
         assert 'active_signals' in result
         assert 'score' in result
-        
-        # Normal conditions should have low score
-        assert result['score'] == 0
-        assert result['active_signals'] == 0
-    
-    def test_extreme_euphoria_high_fear_greed(self, detector):
-        """Test extreme euphoria with high fear & greed index"""
-        btc_data = {'usd': 50000}
-        market_data = {
-            'fear_greed_index': {'value': 90, 'value_classification': 'Extreme Greed'},
-            'btc_dominance': 45.0
-        }
-        
-        result = detector._analyze_extreme_euphoria(btc_data, market_data)
-        
-        # Should trigger euphoria signal
-        assert result['score'] > 0
-        assert result['active_signals'] > 0
-    
-    def test_extreme_euphoria_low_btc_dominance(self, detector):
-        """Test extreme euphoria with high fear & greed (BTC dominance is handled in market structure)"""
-        btc_data = {'usd': 50000}
-        market_data = {
-            'fear_greed_index': {'value': 90, 'value_classification': 'Extreme Greed'},  # High fear & greed
-            'btc_dominance': 45.0
-        }
-        
-        result = detector._analyze_extreme_euphoria(btc_data, market_data)
-        
-        # Should trigger euphoria signal due to high fear & greed
-        assert result['score'] > 0
-        assert result['active_signals'] > 0
+        assert result['score'] == expected_score
+        assert result['active_signals'] == expected_signals
     
     def test_extreme_euphoria_missing_data(self, detector):
         """Test extreme euphoria with missing data"""
@@ -372,19 +297,8 @@ class TestRiskCalculationAndScoring:
     """Test risk calculation and scoring methods"""
     
     @pytest.fixture
-    def detector(self):
-        config = {
-            'professional_alerts': {
-                'cycle_top_detection': {
-                    'risk_thresholds': {
-                        'low': 30,
-                        'medium': 60,
-                        'high': 80
-                    }
-                }
-            }
-        }
-        return CycleTopDetector(config)
+    def detector(self, detector_thresholds):
+        return detector_thresholds
     
     def test_calculate_risk_score_low_risk(self, detector):
         """Test risk score calculation for low risk scenario"""
@@ -415,45 +329,32 @@ class TestRiskCalculationAndScoring:
         assert isinstance(risk_score, int)
         assert risk_score > 80  # Should be high risk
     
-    def test_get_risk_level_classifications(self, detector):
-        """Test risk level classifications"""
-        # Test minimum risk
-        assert detector._get_risk_level(15) == 'MÍNIMO'
-        assert detector._get_risk_level(29) == 'MÍNIMO'
-        
-        # Test low risk
-        assert detector._get_risk_level(30) == 'BAIXO'
-        assert detector._get_risk_level(49) == 'BAIXO'
-        
-        # Test medium risk
-        assert detector._get_risk_level(50) == 'MÉDIO'
-        assert detector._get_risk_level(69) == 'MÉDIO'
-        
-        # Test high risk
-        assert detector._get_risk_level(70) == 'ALTO'
-        assert detector._get_risk_level(84) == 'ALTO'
-        
-        # Test extreme risk
-        assert detector._get_risk_level(85) == 'EXTREMO'
-        assert detector._get_risk_level(100) == 'EXTREMO'
-    
-    def test_should_send_alert_thresholds(self, detector):
+    @pytest.mark.parametrize("score,expected", [
+        (15, 'MÍNIMO'), (29, 'MÍNIMO'),
+        (30, 'BAIXO'), (49, 'BAIXO'),
+        (50, 'MÉDIO'), (69, 'MÉDIO'),
+        (70, 'ALTO'), (84, 'ALTO'),
+        (85, 'EXTREMO'), (100, 'EXTREMO')
+    ])
+    def test_get_risk_level_classifications(self, detector, score, expected):
+        """Test risk level classification boundaries"""
+        assert detector._get_risk_level(score) == expected
+    
+    @pytest.mark.parametrize("score,expected", [
+        (25, False),  # Low risk should not alert
+        (35, True), (65, True), (85, True)  # Medium risk and above should alert
+    ])
+    def test_should_send_alert_thresholds(self, detector, score, expected):
         """Test alert threshold logic"""
-        # Should not alert for low risk
-        assert not detector._should_send_alert(25)
-        
-        # Should alert for medium risk and above
-        assert detector._should_send_alert(35)
-        assert detector._should_send_alert(65)
-        assert detector._should_send_alert(85)
+        assert detector._should_send_alert(score) is expected
 
 
 class TestAlertFormattingAndDashboard:
     """Test alert formatting and dashboard preparation"""
     
     @pytest.fixture
-    def detector(self):
-        return CycleTopDetector({})
+    def detector(self, detector_empty):
+        return detector_empty
     
     def test_format_cycle_alert_basic(self, detector):
         """Test basic cycle alert formatting"""
@@ -526,19 +427,14 @@ class TestEdgeCasesAndErrorHandling:
     """Test edge cases and error handling"""
     
     @pytest.fixture
-    def detector(self):
-        return CycleTopDetector({})
+    def detector(self, detector_empty):
+        return detector_empty
     
     def test_get_default_result_structure(self, detector):
         """Test default result structure"""
         result = detector._get_default_result()
         
-        assert isinstance(result, dict)
-        assert 'risk_score' in result
-        assert 'risk_level' in result
-        assert 'signals' in result
-        assert 'dashboard' in result
-        assert 'should_alert' in result
+        _assert_result_schema(result)
         
         # Default should be safe values
         assert result['risk_score'] == 0
@@ -555,8 +451,7 @@ class TestEdgeCasesAndErrorHandling:
         result = detector.analyze_cycle_top(malformed_data, malformed_market)
         
         # Should handle gracefully
-        assert isinstance(result, dict)
-        assert 'risk_score' in result
+        _assert_result_schema(result)
     
     def test_analyze_with_extreme_values(self, detector):
         """Test analysis with extreme numerical values"""
@@ -577,8 +472,7 @@ class TestEdgeCasesAndErrorHandling:
         result = detector.analyze_cycle_top(extreme_data, extreme_market)
         
         # Should handle extreme values without crashing
-        assert isinstance(result, dict)
-        assert 'risk_score' in result
+        _assert_result_schema(result)
         assert 0 <= result['risk_score'] <= 100
     
     def test_helper_methods_with_none_inputs(self, detector):
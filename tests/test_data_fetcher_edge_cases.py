@@ -5,302 +5,292 @@ Tests network failures, API errors, malformed responses, and boundary conditions
 
 import pytest
 import json
+import re
 import requests
+import responses
 import time
 import threading
-from unittest.mock import Mock, patch
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import patch
+from requests.structures import CaseInsensitiveDict
 
 from src.data_fetcher import DataFetcher
 
 
+_BINANCE_PRICE_URL = "https://api.binance.com/api/v3/ticker/price"
+_COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+
+# Shared read-only CoinGecko payload for stubbed requests (the fetcher must never mutate API data)
+_BTC_COINGECKO = MappingProxyType({'bitcoin': MappingProxyType({'usd': 45000})})
+
+
+def _resp(payload=None, status=200, headers=None, raise_json=None):
+    """Build a lightweight response stand-in (plain namespace, no Mock machinery)"""
+    def _json():
+        if raise_json is not None:
+            raise raise_json
+        return payload
+    
+    return SimpleNamespace(status_code=status, headers=CaseInsensitiveDict(headers or {}),
+                           json=_json, raise_for_status=lambda: None)
+
+
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch):
+    """Record retry/backoff sleeps instead of waiting on the wall clock"""
+    delays = []
+    monkeypatch.setattr('src.api_client.time.sleep', delays.append)
+    return delays
+
+
+@pytest.fixture
+def http_mock():
+    """Serve registered URL routes at the transport level, through the fetcher's real sessions"""
+    with responses.RequestsMock() as mock:
+        yield mock
+
+
+@pytest.fixture(scope="module")
+def fetcher():
+    """One fetcher for the whole module; _reset_fetcher isolates tests"""
+    return DataFetcher(retry_attempts=3, retry_delay=0)
+
+
+@pytest.fixture(autouse=True)
+def _reset_fetcher(fetcher):
+    """Clear response caches, rate limiter and circuit breaker state on the shared fetcher before each test"""
+    for client in (fetcher.binance, fetcher.coingecko):
+        client._cache.clear()
+        client._breakers.clear()
+        client._last_request = 0
+    fetcher._fear_greed_cache = None
+
+
+@pytest.mark.timeout(1)  # Sleeps are patched out, so retry loops must finish almost instantly
 class TestDataFetcherNetworkEdgeCases:
     """Test network-related edge cases and failures"""
     
-    @pytest.fixture
-    def fetcher(self):
-        return DataFetcher(retry_attempts=3, retry_delay=0.1)
-    
-    def test_network_timeout_with_retry_exhaustion(self, fetcher):
-        """Test behavior when all retries are exhausted due to timeouts"""
-        with patch('requests.get') as mock_get:
-            mock_get.side_effect = requests.exceptions.Timeout("Request timeout")
-            
+    @pytest.mark.parametrize("api,error,expected_calls", [
+        ('binance', requests.exceptions.Timeout("Request timeout"), 3),
+        ('binance', requests.exceptions.ConnectionError("Connection failed"), 3),
+        ('coingecko', requests.exceptions.ConnectionError("Name resolution failed"), 3),
+        ('binance', requests.exceptions.SSLError("SSL certificate verify failed"), 1),  # Not retried
+    ], ids=['timeout', 'connection_error', 'dns_failure', 'ssl_error'])
+    def test_network_failure_returns_none(self, fetcher, http_mock, api, error, expected_calls):
+        """Test network failures return None after the expected number of attempts"""
+        if api == 'binance':
+            http_mock.add(responses.GET, _BINANCE_PRICE_URL, body=error)
             result = fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
-            
-            assert result is None
-            assert mock_get.call_count == fetcher.retry_attempts
+        else:
+            http_mock.add(responses.GET, _COINGECKO_PRICE_URL, body=error)
+            result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
+        
+        assert result is None
+        assert len(http_mock.calls) == expected_calls
     
-    def test_network_connection_error_with_retry(self, fetcher):
-        """Test connection errors with retry logic"""
-        with patch('requests.get') as mock_get:
-            mock_get.side_effect = requests.exceptions.ConnectionError("Connection failed")
-            
-            result = fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
-            
-            assert result is None
-            assert mock_get.call_count == fetcher.retry_attempts
+    @pytest.mark.parametrize("status,expected_calls,expected_sleeps,expected_fails", [
+        (400, 1, [], 0),
+        (404, 1, [], 0),
+        (408, 3, [5, 10], 1),  # Request Timeout is transient: retried with backoff, counted as a failure
+    ])
+    def test_client_error_not_retried(self, fetcher, http_mock, sleeps, monkeypatch,
+                                      status, expected_calls, expected_sleeps, expected_fails):
+        """Test caller-error 4xx responses return after one call with no backoff or breaker failure; a 408 is retried"""
+        monkeypatch.setattr(fetcher.binance, 'retry_delay', 5)
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, status=status)
+        
+        result = fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
+        
+        assert result is None
+        assert len(http_mock.calls) == expected_calls
+        assert sleeps == expected_sleeps
+        assert fetcher.binance.get_breaker_state('ticker/price')['fails'] == expected_fails
     
-    def test_partial_timeout_recovery(self, fetcher):
+    def test_partial_timeout_recovery(self, fetcher, http_mock):
         """Test recovery after partial timeouts"""
-        with patch('requests.get') as mock_get:
-            # First two calls timeout, third succeeds
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {'symbol': 'BTCUSDT', 'price': '45000.50'}
-            
-            mock_get.side_effect = [
-                requests.exceptions.Timeout("Timeout 1"),
-                requests.exceptions.Timeout("Timeout 2"),
-                mock_response
-            ]
-            
-            result = fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
-            
-            assert result is not None
-            assert result['symbol'] == 'BTCUSDT'
-            assert mock_get.call_count == 3
-    
-    def test_dns_resolution_failure(self, fetcher):
-        """Test DNS resolution failures"""
-        with patch('requests.get') as mock_get:
-            mock_get.side_effect = requests.exceptions.ConnectionError("Name resolution failed")
-            
-            result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
-            
-            assert result is None
-    
-    def test_ssl_certificate_error(self, fetcher):
-        """Test SSL certificate verification errors"""
-        with patch('requests.get') as mock_get:
-            mock_get.side_effect = requests.exceptions.SSLError("SSL certificate verify failed")
-            
-            result = fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
-            
-            assert result is None
+        # Routes for the same URL are served in registration order: two timeouts, then success
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, body=requests.exceptions.Timeout("Timeout 1"))
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, body=requests.exceptions.Timeout("Timeout 2"))
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, json={'symbol': 'BTCUSDT', 'price': '45000.50'})
+        
+        result = fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
+        
+        assert result is not None
+        assert result['symbol'] == 'BTCUSDT'
+        assert len(http_mock.calls) == 3
 
 
+@pytest.mark.timeout(1)
 class TestDataFetcherRateLimitingEdgeCases:
     """Test rate limiting scenarios and recovery"""
     
-    @pytest.fixture
-    def fetcher(self):
-        return DataFetcher(retry_attempts=3, retry_delay=0.1)
+    def test_rate_limit_429_with_retry_after_header(self, fetcher, http_mock, sleeps):
+        """Test a Retry-After longer than the client's own backoff (5+10+20s) gives up without retrying"""
+        http_mock.add(responses.GET, _COINGECKO_PRICE_URL, status=429, headers={'Retry-After': '60'})
+        
+        result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
+        
+        assert result is None
+        assert len(http_mock.calls) == 1
+        assert sleeps == []
     
-    def test_rate_limit_429_with_retry_after_header(self, fetcher):
-        """Test 429 rate limit with retry-after header"""
-        with patch('requests.get') as mock_get:
-            # Mock 429 response with retry-after header
-            mock_response = Mock()
-            mock_response.status_code = 429
-            mock_response.headers = {'retry-after': '5'}
-            mock_get.return_value = mock_response
-            
-            result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
-            
-            assert result is None
-            assert mock_get.call_count >= 1
+    def test_rate_limit_retry_after_within_backoff_is_honored(self, fetcher, http_mock, sleeps, monkeypatch):
+        """Test a Retry-After shorter than the client's own backoff is waited out, whatever retry_delay is"""
+        monkeypatch.setattr(fetcher.coingecko, 'retry_delay', 5)  # Production config value
+        http_mock.add(responses.GET, _COINGECKO_PRICE_URL, status=429, headers={'Retry-After': '15'})
+        http_mock.add(responses.GET, _COINGECKO_PRICE_URL, json={'bitcoin': {'usd': 45000}})
+        
+        result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
+        
+        assert result == {'bitcoin': {'usd': 45000}}
+        assert sleeps == [15]
     
-    def test_rate_limit_exponential_backoff(self, fetcher):
+    def test_rate_limit_exponential_backoff(self, fetcher, http_mock, sleeps):
         """Test exponential backoff logic for rate limiting"""
-        with patch('requests.get') as mock_get:
-            with patch('time.sleep') as mock_sleep:
-                # All requests return 429
-                mock_response = Mock()
-                mock_response.status_code = 429
-                mock_get.return_value = mock_response
-                
-                result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
-                
-                assert result is None
-                # Verify exponential backoff was called
-                assert mock_sleep.call_count >= 1
-                # Check that sleep times increase (exponential backoff)
-                sleep_calls = [call[0][0] for call in mock_sleep.call_args_list]
-                assert len(sleep_calls) > 0
+        # All requests return 429
+        http_mock.add(responses.GET, _COINGECKO_PRICE_URL, status=429)
+        
+        result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
+        
+        assert result is None
+        # CoinGecko backs off 5s, doubling on each rate-limited attempt
+        assert sleeps == [5, 10, 20]
     
-    def test_rate_limit_recovery_after_backoff(self, fetcher):
+    def test_rate_limit_recovery_after_backoff(self, fetcher, http_mock, sleeps):
         """Test successful recovery after rate limit backoff"""
-        with patch('requests.get') as mock_get:
-            with patch('time.sleep'):
-                # First call returns 429, second succeeds
-                success_response = Mock()
-                success_response.status_code = 200
-                success_response.json.return_value = {'bitcoin': {'usd': 45000}}
-                
-                rate_limit_response = Mock()
-                rate_limit_response.status_code = 429
-                
-                mock_get.side_effect = [rate_limit_response, success_response]
-                
-                result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
-                
-                assert result is not None
-                assert 'bitcoin' in result
-                assert mock_get.call_count == 2
+        # First call returns 429, second succeeds
+        http_mock.add(responses.GET, _COINGECKO_PRICE_URL, status=429)
+        http_mock.add(responses.GET, _COINGECKO_PRICE_URL, json={'bitcoin': {'usd': 45000}})
+        
+        result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
+        
+        assert result is not None
+        assert 'bitcoin' in result
+        assert len(http_mock.calls) == 2
+        assert sleeps == [5]
 
 
 class TestDataFetcherMalformedResponseEdgeCases:
     """Test handling of malformed and invalid API responses"""
     
-    @pytest.fixture
-    def fetcher(self):
-        return DataFetcher(retry_attempts=2, retry_delay=0.1)
-    
-    def test_malformed_json_response(self, fetcher):
-        """Test handling of invalid JSON from API"""
-        with patch('requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-            mock_get.return_value = mock_response
-            
+    @pytest.mark.parametrize("response,expected", [
+        pytest.param(_resp(raise_json=json.JSONDecodeError("Invalid JSON", "", 0)), None, id='malformed-json'),
+        pytest.param(_resp({}), {}, id='empty-json'),
+        pytest.param(_resp(None), None, id='null-json'),
+    ])
+    def test_raw_response_variants(self, fetcher, response, expected):
+        """Test invalid, empty and null JSON bodies are returned or rejected without raising"""
+        with patch('requests.Session.send', return_value=response) as mock_send:
             result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
-            
-            assert result is None
-    
-    def test_empty_json_response(self, fetcher):
-        """Test handling of empty JSON response"""
-        with patch('requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {}
-            mock_get.return_value = mock_response
-            
-            result = fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
-            
-            assert result == {}
-    
-    def test_null_json_response(self, fetcher):
-        """Test handling of null JSON response"""
-        with patch('requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = None
-            mock_get.return_value = mock_response
-            
-            result = fetcher._make_coingecko_request('simple/price', {'ids': 'bitcoin'})
-            
-            assert result is None
-    
-    def test_missing_required_fields_in_response(self, fetcher):
-        """Test handling when required fields are missing from response"""
-        with patch('requests.get') as mock_get:
-            # Response missing 'price' field
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {'symbol': 'BTCUSDT'}  # Missing 'price'
-            mock_get.return_value = mock_response
-            
-            result = fetcher.get_binance_price('BTCUSDT')
-            
-            # Should handle gracefully - either return None or partial data
-            assert result is None or 'price' not in result
-    
-    def test_unexpected_data_types_in_response(self, fetcher):
-        """Test handling of unexpected data types in API response"""
-        with patch('requests.get') as mock_get:
-            # Price as integer instead of string
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {'symbol': 'BTCUSDT', 'price': 45000}  # int instead of str
-            mock_get.return_value = mock_response
-            
-            result = fetcher.get_binance_price('BTCUSDT')
-            
-            # Should handle different data types gracefully
-            assert result is not None
-            assert 'symbol' in result
+        
+        assert result == expected
+        assert mock_send.call_count == 1  # Bad bodies are not retried
     
-    def test_extremely_large_price_values(self, fetcher):
-        """Test handling of unrealistic price values"""
-        with patch.object(fetcher, '_make_binance_request') as mock_request:
-            # Extremely large price that might cause overflow
-            large_price = "999999999999999999999.99999999"
-            mock_request.return_value = {'symbol': 'BTCUSDT', 'price': large_price}
-            
+    @pytest.mark.parametrize("payload,expected", [
+        pytest.param({'symbol': 'BTCUSDT'}, None, id='missing-price'),
+        pytest.param({'symbol': 'BTCUSDT', 'price': 45000}, {'symbol': 'BTCUSDT', 'price': 45000}, id='int-price'),
+    ])
+    def test_price_payload_variants(self, fetcher, payload, expected):
+        """Test missing fields and unexpected types in price responses are handled gracefully"""
+        with patch('requests.Session.send', return_value=_resp(payload)):
             result = fetcher.get_binance_price('BTCUSDT')
-            
-            # Should handle large numbers without crashing
-            assert result is not None
-            if 'price' in result:
-                # Should not cause overflow errors
-                try:
-                    float(result['price'])
-                    assert float(result['price']) < float('inf')
-                except (ValueError, OverflowError):
-                    # Acceptable to reject invalid values
-                    pass
+        
+        assert result == expected
     
-    def test_extremely_small_price_values(self, fetcher):
-        """Test handling of very small price values"""
-        with patch.object(fetcher, '_make_binance_request') as mock_request:
-            # Very small price that might cause underflow
-            small_price = "0.000000000000000001"
-            mock_request.return_value = {'symbol': 'BTCUSDT', 'price': small_price}
-            
+    @pytest.mark.parametrize("price", [
+        pytest.param("999999999999999999999.99999999", id='huge'),
+        pytest.param("0.000000000000000001", id='tiny'),
+    ])
+    def test_extreme_price_values(self, fetcher, price):
+        """Test extreme price strings pass through without overflow or underflow"""
+        with patch.object(fetcher, '_make_binance_request', return_value={'symbol': 'BTCUSDT', 'price': price}):
             result = fetcher.get_binance_price('BTCUSDT')
-            
-            # Should handle small numbers without underflow
-            assert result is not None
-            if 'price' in result:
-                try:
-                    price_float = float(result['price'])
-                    assert price_float >= 0
-                except ValueError:
-                    # Acceptable to reject invalid values
-                    pass
+        
+        assert result == {'symbol': 'BTCUSDT', 'price': price}
+        assert 0 <= float(result['price']) < float('inf')
 
 
 class TestDataFetcherAPIFallbackEdgeCases:
     """Test API fallback behavior and edge cases"""
     
-    @pytest.fixture
-    def fetcher(self):
-        return DataFetcher(retry_attempts=2, retry_delay=0.1)
+    def test_fallback_binance_to_coingecko(self, fetcher, monkeypatch):
+        """Test a Binance outage falls through to the real CoinGecko fallback path"""
+        coingecko_calls = []
+        
+        def coingecko_request(endpoint, params=None):
+            coingecko_calls.append(endpoint)
+            return _BTC_COINGECKO if endpoint == 'simple/price' else None
+        
+        monkeypatch.setattr(fetcher.binance, 'make_request', lambda *args, **kwargs: None)
+        monkeypatch.setattr(fetcher, 'coinmarketcap', None)
+        monkeypatch.setattr(fetcher, '_make_coingecko_request', coingecko_request)
+        
+        result = fetcher.get_coin_market_data_batch(['bitcoin'])
+        
+        assert result['bitcoin']['usd'] == 45000
+        assert 'simple/price' in coingecko_calls
     
-    def test_binance_down_coingecko_working(self, fetcher):
-        """Test fallback when Binance is down but CoinGecko works"""
-        with patch('src.data_fetcher.DataFetcher.get_coin_market_data_batch') as mock_batch:
-            mock_batch.return_value = {'bitcoin': {'usd': 45000, 'source': 'coingecko'}}
-            
-            result = fetcher.get_coin_market_data_batch(['bitcoin'])
-            
-            assert result is not None
-            if 'bitcoin' in result:
-                assert result['bitcoin']['usd'] == 45000
-
-    def test_coingecko_down_binance_working(self, fetcher):
-        """Test fallback when CoinGecko is down but Binance works"""
-        with patch('src.data_fetcher.DataFetcher.get_coin_market_data_batch') as mock_batch:
-            mock_batch.return_value = {'bitcoin': {'usd': 45000.50, 'source': 'binance'}}
-            
-            result = fetcher.get_coin_market_data_batch(['bitcoin'])
-            
-            # Should fallback to Binance
-            if result and 'bitcoin' in result:
-                assert result['bitcoin']['usd'] == 45000.50
-
-    def test_both_apis_down_graceful_degradation(self, fetcher):
-        """Test graceful degradation when both APIs are down"""
-        with patch('src.data_fetcher.DataFetcher.get_coin_market_data_batch') as mock_batch:
-            mock_batch.return_value = {}
-            
-            result = fetcher.get_coin_market_data_batch(['bitcoin'])
-            
-            # Should handle gracefully - return empty dict or None
-            assert result is None or result == {}
+    def test_both_apis_down_graceful_degradation(self, fetcher, http_mock):
+        """Sustained outage on both APIs degrades to an empty result, then fails fast"""
+        http_mock.add(responses.GET, re.compile(r"https://api\.(binance|coingecko)\.com/.*"), status=503)
+        
+        for _ in range(5):
+            assert fetcher.get_coin_market_data_batch(['bitcoin']) == {}
+        calls_before = len(http_mock.calls)
+        
+        # Every endpoint's breaker is open now, so no further HTTP calls are made
+        assert fetcher.get_coin_market_data_batch(['bitcoin']) == {}
+        assert len(http_mock.calls) == calls_before
+    
+    def test_circuit_breaker_trips(self, fetcher, http_mock):
+        """Five consecutive failed requests open the breaker; the sixth makes no HTTP call"""
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, status=500)
+        
+        for _ in range(5):
+            assert fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'}) is None
+        assert len(http_mock.calls) == 5 * 3  # Each failure used all retry attempts
+        
+        assert fetcher._make_binance_request('ticker/price', {'symbol': 'ETHUSDT'}) is None
+        assert len(http_mock.calls) == 15
+    
+    def test_circuit_breaker_cooldown_grows_per_trip(self, fetcher, http_mock):
+        """Each failed half-open probe re-opens the breaker with a doubled cooldown, capped at 300s"""
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, status=500)
+        for _ in range(5):
+            fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
+        
+        cooldowns = []
+        for _ in range(6):
+            state = fetcher.binance.get_breaker_state('ticker/price')
+            assert state['state'] == 'open'
+            cooldowns.append(int(state['cooldown']))  # Drop the sub-second jitter
+            fetcher.binance._breakers['ticker/price']['opened_at'] -= state['cooldown']
+            assert fetcher.binance.get_breaker_state('ticker/price')['state'] == 'half-open'
+            fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})  # Probe fails
+        
+        assert cooldowns == [30, 60, 120, 240, 300, 300]
+        assert fetcher.binance.get_breaker_state('ticker/price')['trips'] == 7
+    
+    def test_circuit_breaker_half_open_recovers(self, fetcher, http_mock):
+        """After the cooldown one probe goes through and a success closes the breaker"""
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, status=500)
+        for _ in range(5):
+            fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
+        assert fetcher.binance._is_circuit_open('ticker/price')
+        
+        fetcher.binance._breakers['ticker/price']['opened_at'] -= 32  # Cooldown elapsed
+        http_mock.replace(responses.GET, _BINANCE_PRICE_URL, json={'symbol': 'BTCUSDT', 'price': '45000.00'})
+        
+        assert fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'}) == {'symbol': 'BTCUSDT', 'price': '45000.00'}
+        assert fetcher.binance.get_breaker_state('ticker/price') == {'state': 'closed', 'fails': 0, 'trips': 0, 'cooldown': 0.0}
     
     def test_partial_api_outage_mixed_results(self, fetcher):
         """Test handling when some API calls succeed and others fail"""
         def mock_coingecko_request(endpoint, params=None):
             # Simulate partial outage - some coins work, others don't
             if params and 'bitcoin' in params.get('ids', ''):
-                return {'bitcoin': {'usd': 45000}}
+                return _BTC_COINGECKO
             return None
         
         with patch.object(fetcher, '_make_coingecko_request', side_effect=mock_coingecko_request):
@@ -311,68 +301,76 @@ class TestDataFetcherAPIFallbackEdgeCases:
                 assert 'bitcoin' in result or len(result) >= 0
 
 
+@pytest.mark.xdist_group(name="concurrency")
 class TestDataFetcherConcurrencyEdgeCases:
     """Test thread safety and concurrent request handling"""
     
-    @pytest.fixture
-    def fetcher(self):
-        return DataFetcher(retry_attempts=2, retry_delay=0.1)
+    @pytest.fixture(scope="class")
+    def pool(self):
+        """Worker threads reused by every concurrency test"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            yield executor
     
-    def test_concurrent_cache_access(self, fetcher):
+    def test_concurrent_cache_access(self, fetcher, pool):
         """Test that cache access is thread-safe"""
-        import threading
-        import time
+        # Two threads released together are enough to overlap inside the fetcher
+        barrier = threading.Barrier(2, timeout=5)
         
-        results = []
+        def fetch(_):
+            barrier.wait()
+            return fetcher.get_coin_market_data_batch(['bitcoin'])
         
-        def make_request():
-            with patch.object(fetcher, '_make_coingecko_request') as mock_request:
-                mock_request.return_value = {'bitcoin': {'usd': 45000}}
-                result = fetcher.get_coin_market_data_batch(['bitcoin'])
-                results.append(result)
+        # Binance is down, so every thread falls back to the (mocked) CoinGecko request
+        with patch.object(fetcher.binance, 'make_request', return_value=None), \
+             patch.object(fetcher, '_make_coingecko_request', return_value=_BTC_COINGECKO):
+            results = list(pool.map(fetch, range(2)))
         
-        # Create multiple threads making concurrent requests
-        threads = []
+        # All requests should complete without errors
+        assert len(results) == 2
+        for result in results:
+            assert result['bitcoin']['usd'] == 45000
+    
+    def test_circuit_breaker_half_open_admits_one_probe(self, fetcher, http_mock):
+        """Concurrent callers after the cooldown send a single probe; its failure counts as one trip"""
+        http_mock.add(responses.GET, _BINANCE_PRICE_URL, status=500)
         for _ in range(5):
-            thread = threading.Thread(target=make_request)
-            threads.append(thread)
-            thread.start()
+            fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
+        calls_before = len(http_mock.calls)
+        fetcher.binance._breakers['ticker/price']['opened_at'] -= 32  # Cooldown elapsed
         
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        workers = 8  # Matches the batch fetcher's thread pool
+        barrier = threading.Barrier(workers, timeout=5)
         
-        # All requests should complete without errors
-        assert len(results) == 5
-        for result in results:
-            assert result is not None or result == {}
+        def probe(_):
+            barrier.wait()
+            return fetcher._make_binance_request('ticker/price', {'symbol': 'BTCUSDT'})
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            assert list(executor.map(probe, range(workers))) == [None] * workers
+        
+        assert len(http_mock.calls) - calls_before == 3  # One probe, using its retry attempts
+        state = fetcher.binance.get_breaker_state('ticker/price')
+        assert state['state'] == 'open'
+        assert state['trips'] == 2
+        assert int(state['cooldown']) == 60
     
-    def test_rate_limiting_thread_safety(self, fetcher):
+    def test_rate_limiting_thread_safety(self, fetcher, pool):
         """Test that rate limiting is properly synchronized across threads"""
-        import threading
+        barrier = threading.Barrier(2, timeout=5)
         
-        call_times = []
-        
-        def timed_request():
+        def timed_request(_):
+            barrier.wait()
             start_time = time.time()
-            with patch.object(fetcher, '_make_coingecko_request') as mock_request:
-                mock_request.return_value = {'bitcoin': {'usd': 45000}}
-                fetcher.get_coin_market_data_batch(['bitcoin'])
-            call_times.append(time.time() - start_time)
+            fetcher.get_coin_market_data_batch(['bitcoin'])
+            return time.time() - start_time
         
         # Make concurrent requests that should be rate-limited
-        threads = []
-        for _ in range(3):
-            thread = threading.Thread(target=timed_request)
-            threads.append(thread)
-            thread.start()
-        
-        for thread in threads:
-            thread.join()
+        with patch.object(fetcher.binance, 'make_request', return_value=None), \
+             patch.object(fetcher, '_make_coingecko_request', return_value=_BTC_COINGECKO):
+            call_times = list(pool.map(timed_request, range(2)))
         
         # Should complete without race conditions
-        assert len(call_times) == 3
-
+        assert len(call_times) == 2
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -6,46 +6,53 @@ import pytest
 import pandas as pd
 import numpy as np
 from unittest.mock import Mock, patch
-from src.indicators import TechnicalIndicators
+from src.indicators import TechnicalIndicators, _close_array
 
+# Daily index shared by every fixture and test; slice it instead of rebuilding date ranges
+_DATES = pd.date_range('2023-01-01', periods=400, freq='D')
 
+
+@pytest.fixture
+def pandas_ta_backend(monkeypatch):
+    """Force the pandas-ta code path so patches on src.indicators.ta apply even with TA-Lib installed"""
+    monkeypatch.setattr('src.indicators.talib', None)
+
+
+@pytest.mark.usefixtures("pandas_ta_backend")
 class TestTechnicalIndicators:
     """Test cases for TechnicalIndicators class"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def indicators(self):
         """Create a TechnicalIndicators instance for testing"""
         return TechnicalIndicators()
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_price_data(self):
-        """Create sample price data for testing"""
-        dates = pd.date_range('2023-01-01', periods=250, freq='D')  # Increased to 250 for MA200
-        np.random.seed(42)  # For reproducible tests
+        """Create sample price data for testing (shared by the class; read-only)"""
+        dates = _DATES[:250]  # Increased to 250 for MA200
+        rng = np.random.default_rng(42)  # Local generator for reproducible tests
         
-        # Generate realistic price data
-        price = 45000  # Starting price
-        prices = [price]
+        # Generate realistic price data: a 45000 start plus 249 steps of 2% daily volatility
+        changes = rng.normal(0, 0.02, 249)
+        prices = 45000 * np.concatenate(([1.0], np.cumprod(1 + changes)))
         
-        for _ in range(249):  # 249 more prices for total of 250
-            change = np.random.normal(0, 0.02)  # 2% daily volatility
-            price = price * (1 + change)
-            prices.append(price)
+        # Fill the float columns of one preallocated block (draw order matches the columns)
+        data = np.empty((prices.size, 4))
+        data[:, 0] = prices
+        data[:, 1] = prices * (1 + np.abs(rng.normal(0, 0.01, prices.size)))
+        data[:, 2] = prices * (1 - np.abs(rng.normal(0, 0.01, prices.size)))
+        data[:, 3] = prices
         
-        df = pd.DataFrame({
-            'open': prices,
-            'high': [p * (1 + abs(np.random.normal(0, 0.01))) for p in prices],
-            'low': [p * (1 - abs(np.random.normal(0, 0.01))) for p in prices],
-            'close': prices,
-            'volume': np.random.randint(1000000, 10000000, 250)  # Match the length
-        }, index=dates)
+        df = pd.DataFrame(data, columns=['open', 'high', 'low', 'close'], index=dates, copy=False)
+        df['volume'] = rng.integers(1000000, 10000000, 250)  # Match the length
         
         return df
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def minimal_price_data(self):
-        """Create minimal price data for edge case testing"""
-        dates = pd.date_range('2023-01-01', periods=5, freq='D')
+        """Create minimal price data for edge case testing (shared by the class; read-only)"""
+        dates = _DATES[:5]
         df = pd.DataFrame({
             'close': [100, 105, 102, 108, 110]
         }, index=dates)
@@ -113,20 +120,31 @@ class TestTechnicalIndicators:
         assert 'signal' in result
         assert 'histogram' in result
     
-    @patch('src.indicators.ta.sma')
-    def test_calculate_moving_averages_success(self, mock_sma, indicators, sample_price_data):
+    def test_calculate_moving_averages_success(self, indicators, sample_price_data):
         """Test successful moving averages calculation"""
+        result = indicators.calculate_moving_averages(sample_price_data, 50, 200)
+        
+        assert result is not None
+        assert isinstance(result, dict)
+        assert 'ma_short' in result
+        assert 'ma_long' in result
+        close = sample_price_data['close']
+        pd.testing.assert_series_equal(result['ma_short'], close.rolling(50).mean(), check_names=False)
+        pd.testing.assert_series_equal(result['ma_long'], close.rolling(200).mean(), check_names=False)
+    
+    @patch('src.indicators.ta.sma')
+    def test_moving_averages_fall_back_to_rolling_on_gaps(self, mock_sma, indicators, sample_price_data):
+        """Test a NaN close sends both averages through the per-window SMA"""
+        df = sample_price_data.copy()
+        df.iloc[100, df.columns.get_loc('close')] = np.nan
         mock_sma.side_effect = [
             pd.Series([45100, 45200, 45300], name='SMA_50'),  # Short MA
             pd.Series([45000, 45100, 45200], name='SMA_200')  # Long MA
         ]
         
-        result = indicators.calculate_moving_averages(sample_price_data, 50, 200)
+        result = indicators.calculate_moving_averages(df, 50, 200)
         
         assert result is not None
-        assert isinstance(result, dict)
-        assert 'ma_short' in result
-        assert 'ma_long' in result
         assert mock_sma.call_count == 2
     
     @patch('src.indicators.ta.ema')
@@ -208,49 +226,24 @@ class TestTechnicalIndicators:
         assert result['rsi'] == 55.0
         assert result['current_price'] == sample_price_data['close'].iloc[-1]
     
-    def test_detect_crossovers_bullish(self, indicators):
-        """Test bullish crossover detection"""
-        # Create a proper bullish crossover: series1 was below, now above series2
-        series1 = pd.Series([1, 2, 2.5, 2.8, 3.2])  # Crosses above 3 at the end
-        series2 = pd.Series([3, 3, 3, 3, 3])        # Flat at 3
-        
-        result = indicators.detect_crossovers(series1, series2, periods_back=2)
-        
-        # Check: series1[-2] = 2.8 <= 3, series1[-1] = 3.2 > 3 = bullish crossover
-        assert result['bullish_crossover'] is True
-        assert result['bearish_crossover'] is False
-    
-    def test_detect_crossovers_bearish(self, indicators):
-        """Test bearish crossover detection"""
-        # Create a proper bearish crossover: series1 was above, now below series2
-        series1 = pd.Series([5, 4, 3.2, 3.1, 2.8])  # Crosses below 3 at the end
-        series2 = pd.Series([3, 3, 3, 3, 3])        # Flat at 3
-        
-        result = indicators.detect_crossovers(series1, series2, periods_back=2)
-        
-        # Check: series1[-2] = 3.1 >= 3, series1[-1] = 2.8 < 3 = bearish crossover
-        assert result['bullish_crossover'] is False
-        assert result['bearish_crossover'] is True
-    
-    def test_detect_crossovers_no_crossover(self, indicators):
-        """Test no crossover detection"""
-        series1 = pd.Series([1, 1, 1, 1, 1])  # Flat series
-        series2 = pd.Series([2, 2, 2, 2, 2])  # Flat series (higher)
-        
-        result = indicators.detect_crossovers(series1, series2, periods_back=2)
-        
-        assert result['bullish_crossover'] is False
-        assert result['bearish_crossover'] is False
-    
-    def test_detect_crossovers_insufficient_data(self, indicators):
-        """Test crossover detection with insufficient data"""
-        series1 = pd.Series([1])
-        series2 = pd.Series([2])
-        
-        result = indicators.detect_crossovers(series1, series2, periods_back=2)
-        
-        assert result['bullish_crossover'] is False
-        assert result['bearish_crossover'] is False
+    @pytest.mark.parametrize("series1,series2,expected_bullish,expected_bearish", [
+        # series1[-2] = 2.8 <= 3, series1[-1] = 3.2 > 3: crosses above
+        ([1, 2, 2.5, 2.8, 3.2], [3, 3, 3, 3, 3], True, False),
+        # series1[-2] = 3.1 >= 3, series1[-1] = 2.8 < 3: crosses below
+        ([5, 4, 3.2, 3.1, 2.8], [3, 3, 3, 3, 3], False, True),
+        # Flat series, series2 always higher
+        ([1, 1, 1, 1, 1], [2, 2, 2, 2, 2], False, False),
+        # Too short to compare two points
+        ([1], [2], False, False),
+        # Crossed long ago; only the latest two points decide
+        (np.r_[np.zeros(500), np.full(500, 5.0)], np.full(1000, 3.0), False, False),
+    ], ids=['bullish', 'bearish', 'no_crossover', 'insufficient_data', 'ignores_older_crosses'])
+    def test_detect_crossovers(self, indicators, series1, series2, expected_bullish, expected_bearish):
+        """Test bullish/bearish crossover detection"""
+        result = indicators.detect_crossovers(pd.Series(series1), pd.Series(series2), periods_back=2)
+        
+        assert result['bullish_crossover'] is expected_bullish
+        assert result['bearish_crossover'] is expected_bearish
     
     def test_calculate_support_resistance_success(self, indicators, sample_price_data):
         """Test successful support/resistance calculation"""
@@ -286,40 +279,30 @@ class TestTechnicalIndicators:
 class TestNewIndicators:
     """Test cases for new technical indicators: Pi Cycle Top and 3-Line RCI"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def indicators(self):
         """Create a TechnicalIndicators instance for testing"""
         return TechnicalIndicators()
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def btc_price_data(self):
-        """Create realistic BTC price data for Pi Cycle testing"""
-        dates = pd.date_range('2023-01-01', periods=400, freq='D')  # 400 days for 350-day MA
-        np.random.seed(42)
+        """Create realistic BTC price data for Pi Cycle testing (shared by the class; read-only)"""
+        dates = _DATES[:400]  # 400 days for 350-day MA
+        rng = np.random.default_rng(42)
         
         # Simulate BTC bull run price action
         base_price = 20000
-        prices = []
-        current_price = base_price
-        
-        for i in range(400):
-            # Simulate bull market with some volatility
-            if i < 200:
-                # Early bull market - steady growth
-                growth = np.random.normal(0.003, 0.025)  # 0.3% daily growth avg
-            else:
-                # Late bull market - more volatile, potential top
-                growth = np.random.normal(0.002, 0.035)  # Slower growth, more volatile
-            
-            current_price = current_price * (1 + growth)
-            prices.append(current_price)
+        early = np.arange(400) < 200
+        # Early bull market: steady 0.3% daily growth; late: slower growth, more volatile
+        growth = rng.normal(np.where(early, 0.003, 0.002), np.where(early, 0.025, 0.035))
+        prices = base_price * np.cumprod(1 + growth)
         
         df = pd.DataFrame({
             'open': prices,
-            'high': [p * (1 + abs(np.random.normal(0, 0.01))) for p in prices],
-            'low': [p * (1 - abs(np.random.normal(0, 0.01))) for p in prices],
+            'high': prices * (1 + np.abs(rng.normal(0, 0.01, prices.size))),
+            'low': prices * (1 - np.abs(rng.normal(0, 0.01, prices.size))),
             'close': prices,
-            'volume': np.random.randint(1000000, 50000000, 400)
+            'volume': rng.integers(1000000, 50000000, 400)
         }, index=dates)
         
         return df
@@ -346,7 +329,7 @@ class TestNewIndicators:
     def test_pi_cycle_top_insufficient_data(self, indicators):
         """Test Pi Cycle Top with insufficient data"""
         # Create data with only 100 days (less than required 350)
-        dates = pd.date_range('2023-01-01', periods=100, freq='D')
+        dates = _DATES[:100]
         df = pd.DataFrame({
             'close': list(range(100))
         }, index=dates)
@@ -379,7 +362,7 @@ class TestNewIndicators:
     def test_pi_cycle_top_crossover_detection(self, indicators):
         """Test Pi Cycle Top crossover detection logic"""
         # Create synthetic data that should trigger Pi Cycle signal
-        dates = pd.date_range('2023-01-01', periods=400, freq='D')
+        dates = _DATES[:400]
         
         # Create a scenario where 111-day MA crosses above 2x 350-day MA near the end
         base_prices = []
@@ -403,6 +386,19 @@ class TestNewIndicators:
         assert result['ma_111'] is not None
         assert result['ma_350_2x'] is not None
     
+    def test_pi_cycle_top_crossover_on_latest_bar(self, indicators):
+        """Test a short MA crossing above 2x the long MA on the last bar is flagged"""
+        # Flat at 100, then a spike: MA3 goes 100 -> 400 while 2x MA10 goes 200 -> 380
+        df = pd.DataFrame({'close': [100.0] * 20 + [1000.0]})
+        
+        result = indicators.calculate_pi_cycle_top(df, short_period=3, long_period=10)
+        
+        assert result['ma_111'] == pytest.approx(400.0)
+        assert result['ma_350_2x'] == pytest.approx(380.0)
+        assert result['pi_cycle_signal'] is True
+        assert result['crossover_detected'] is True
+        assert result['risk_level'] == 'HIGH'
+    
     def test_rci_3_line_calculation_success(self, indicators, btc_price_data):
         """Test successful 3-line RCI calculation"""
         result = indicators.calculate_rci_3_line(btc_price_data)
@@ -424,7 +420,7 @@ class TestNewIndicators:
     def test_rci_3_line_insufficient_data(self, indicators):
         """Test 3-line RCI with insufficient data"""
         # Create data with only 5 days (less than required 52)
-        dates = pd.date_range('2023-01-01', periods=5, freq='D')
+        dates = _DATES[:5]
         df = pd.DataFrame({
             'close': [100, 105, 102, 108, 110]
         }, index=dates)
@@ -456,6 +452,36 @@ class TestNewIndicators:
             assert -100 <= rci_value <= 100
             assert isinstance(rci_value, (int, float))
     
+    @pytest.mark.parametrize("prices,expected", [
+        ([1, 2, 3, 4, 5], 100.0),   # Prices rising with time
+        ([5, 4, 3, 2, 1], -100.0),  # Prices falling with time
+    ])
+    def test_single_rci_extremes(self, indicators, prices, expected):
+        """Test RCI is +/-100 for perfectly trending prices"""
+        assert indicators._calculate_single_rci(pd.Series(prices, dtype=float), period=5) == expected
+    
+    def test_single_rci_ties_use_min_rank(self, indicators):
+        """Test tied prices share the lowest rank, as pandas rank(method='min') does"""
+        prices = pd.Series([10, 12, 12, 11, 15, 15, 14, 16, 16], dtype=float)
+        price_ranks = prices.rank(method='min').to_numpy()
+        d_squared = ((price_ranks - np.arange(1, 10)) ** 2).sum()
+        expected = (1 - 6 * d_squared / (9 * (9 ** 2 - 1))) * 100
+        
+        assert indicators._calculate_single_rci(pd.DataFrame({'close': prices}), period=9) == pytest.approx(expected)
+    
+    def test_rci_3_line_matches_rank_reference(self, indicators, btc_price_data):
+        """Test the 3-line RCI against the pandas rank formula and converts the closes once"""
+        with patch('src.indicators._close_array', wraps=_close_array) as close_array:
+            result = indicators.calculate_rci_3_line(btc_price_data)
+        close_array.assert_called_once()
+        
+        for name, period in zip(['short', 'medium', 'long'], [9, 26, 52]):
+            window = btc_price_data['close'].iloc[-period:].reset_index(drop=True)
+            price_ranks = window.rank(method='min')
+            d_squared = ((price_ranks - np.arange(1, period + 1)) ** 2).sum()
+            expected = (1 - (6 * d_squared) / (period * (period ** 2 - 1))) * 100
+            assert result[f'rci_{name}'] == pytest.approx(expected)
+    
     def test_single_rci_insufficient_data(self, indicators):
         """Test single RCI with insufficient data"""
         short_series = pd.Series([100, 105, 102])
@@ -463,71 +489,17 @@ class TestNewIndicators:
         
         assert rci_value is None
     
-    def test_rci_signal_analysis_all_bullish(self, indicators):
-        """Test RCI signal analysis with all bullish signals"""
-        rci_values = {
-            'short': 60,
-            'medium': 40,
-            'long': 30
-        }
-        
-        signal = indicators._analyze_rci_signals(rci_values)
-        assert signal == 'STRONG_BUY'
-    
-    def test_rci_signal_analysis_all_bearish(self, indicators):
-        """Test RCI signal analysis with all bearish signals"""
-        rci_values = {
-            'short': -60,
-            'medium': -40,
-            'long': -30
-        }
-        
-        signal = indicators._analyze_rci_signals(rci_values)
-        assert signal == 'STRONG_SELL'
-    
-    def test_rci_signal_analysis_majority_bullish(self, indicators):
-        """Test RCI signal analysis with majority bullish"""
-        rci_values = {
-            'short': 30,
-            'medium': 20,
-            'long': -10
-        }
-        
-        signal = indicators._analyze_rci_signals(rci_values)
-        assert signal == 'BUY'
-    
-    def test_rci_signal_analysis_majority_bearish(self, indicators):
-        """Test RCI signal analysis with majority bearish"""
-        rci_values = {
-            'short': -30,
-            'medium': -20,
-            'long': 10
-        }
-        
-        signal = indicators._analyze_rci_signals(rci_values)
-        assert signal == 'SELL'
-    
-    def test_rci_signal_analysis_neutral(self, indicators):
-        """Test RCI signal analysis with neutral/mixed signals"""
-        rci_values = {
-            'short': -1,
-            'medium': 1,
-            'long': 0
-        }
-        
-        signal = indicators._analyze_rci_signals(rci_values)
-        assert signal == 'NEUTRAL'
-    
-    def test_rci_signal_analysis_with_none_values(self, indicators):
-        """Test RCI signal analysis with None values"""
-        rci_values = {
-            'short': None,
-            'medium': 20,
-            'long': 30
-        }
-        
-        signal = indicators._analyze_rci_signals(rci_values)
-        assert signal == 'NEUTRAL'
+    @pytest.mark.parametrize("rci_values,expected", [
+        ({'short': 60, 'medium': 40, 'long': 30}, 'STRONG_BUY'),     # All bullish
+        ({'short': -60, 'medium': -40, 'long': -30}, 'STRONG_SELL'), # All bearish
+        ({'short': 30, 'medium': 20, 'long': -10}, 'BUY'),           # Majority bullish
+        ({'short': -30, 'medium': -20, 'long': 10}, 'SELL'),         # Majority bearish
+        ({'short': -1, 'medium': 1, 'long': 0}, 'NEUTRAL'),          # Mixed signals
+        ({'short': None, 'medium': 20, 'long': 30}, 'NEUTRAL'),      # Missing value
+    ], ids=['all_bullish', 'all_bearish', 'majority_bullish', 'majority_bearish', 'neutral', 'with_none_values'])
+    def test_rci_signal_analysis(self, indicators, rci_values, expected):
+        """Test RCI signal analysis across bullish, bearish and mixed readings"""
+        assert indicators._analyze_rci_signals(rci_values) == expected
 
     # Integration tests
     def test_get_latest_indicator_values_with_new_indicators(self, indicators, btc_price_data):
@@ -597,7 +569,7 @@ class TestNewIndicators:
 class TestIndicatorsEdgeCases:
     """Test critical edge cases and boundary conditions for technical indicators"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def indicators(self):
         return TechnicalIndicators()
     
@@ -609,7 +581,7 @@ class TestIndicatorsEdgeCases:
             'high': [101, np.nan, 103, 102, np.nan, 104, 105],
             'low': [99, np.nan, 101, 100, np.nan, 102, 103],
             'volume': [1000, np.nan, 1100, 1050, np.nan, 1200, 1150],
-            'timestamp': pd.date_range('2023-01-01', periods=7)
+            'timestamp': _DATES[:7]
         })
         
         # RSI calculation should handle NaN gracefully
@@ -648,7 +620,7 @@ class TestIndicatorsEdgeCases:
             'high': [101, np.inf, 103, 102, -np.inf, 104, 105],
             'low': [99, np.inf, 101, 100, -np.inf, 102, 103],
             'volume': [1000, np.inf, 1100, 1050, -np.inf, 1200, 1150],
-            'timestamp': pd.date_range('2023-01-01', periods=7)
+            'timestamp': _DATES[:7]
         })
         
         # Should handle infinite values without crashing
@@ -666,7 +638,7 @@ class TestIndicatorsEdgeCases:
             'high': [101, 102],
             'low': [99, 100],
             'volume': [1000, 1100],
-            'timestamp': pd.date_range('2023-01-01', periods=2)
+            'timestamp': _DATES[:2]
         })
         
         # RSI with period 14 should handle insufficient data
@@ -694,7 +666,7 @@ class TestIndicatorsEdgeCases:
             'high': [101, 1, -49, 102, 1, 104, -9],
             'low': [99, -1, -51, 100, -1, 102, -11],
             'volume': [1000, 1100, 1050, 1200, 1150, 1300, 1250],
-            'timestamp': pd.date_range('2023-01-01', periods=7)
+            'timestamp': _DATES[:7]
         })
         
         # Should handle zero and negative prices gracefully
@@ -719,7 +691,7 @@ class TestIndicatorsEdgeCases:
             'close': [100, 101, 102, 103, 104],
             'low': [99, 100, 101, 102, 103],
             'volume': [1000, 1100, 1200, 1300, 1400],
-            'timestamp': pd.date_range('2023-01-01', periods=5)
+            'timestamp': _DATES[:5]
         })
         
         # Should handle missing columns gracefully
@@ -736,7 +708,7 @@ class TestIndicatorsEdgeCases:
         # Test with only 'close' column
         df_close_only = pd.DataFrame({
             'close': [100, 101, 102, 103, 104, 105, 106],
-            'timestamp': pd.date_range('2023-01-01', periods=7)
+            'timestamp': _DATES[:7]
         })
         
         # RSI should work with just close prices
@@ -755,7 +727,7 @@ class TestIndicatorsEdgeCases:
             'high': [p * 1.1 for p in extreme_prices],
             'low': [p * 0.9 for p in extreme_prices],
             'volume': [1000] * len(extreme_prices),
-            'timestamp': pd.date_range('2023-01-01', periods=len(extreme_prices))
+            'timestamp': _DATES[:len(extreme_prices)]
         })
         
         # Should handle extreme volatility without crashing
@@ -768,9 +740,11 @@ class TestIndicatorsEdgeCases:
         try:
             result = indicators.calculate_bollinger_bands(df, period=5)
             assert isinstance(result, dict)
-            # Bollinger bands should handle extreme volatility
-            if result.get('bb_upper') and result.get('bb_lower'):
-                assert result['bb_upper'] > result['bb_lower']
+            # Bollinger bands should handle extreme volatility: a population std around the 5-bar mean
+            window = np.array(extreme_prices[-5:], dtype=float)
+            assert result['bb_middle'].iloc[-1] == pytest.approx(window.mean())
+            assert result['bb_upper'].iloc[-1] == pytest.approx(window.mean() + 2 * window.std())
+            assert result['bb_lower'].iloc[-1] == pytest.approx(window.mean() - 2 * window.std())
         except Exception as e:
             assert False, f"Bollinger Bands crashed with extreme volatility: {e}"
     
@@ -818,7 +792,7 @@ class TestIndicatorsEdgeCases:
             'high': [100] * 20,
             'low': [100] * 20,
             'volume': [1000] * 20,
-            'timestamp': pd.date_range('2023-01-01', periods=20)
+            'timestamp': _DATES[:20]
         })
         
         # RSI should handle no price movement
@@ -833,9 +807,9 @@ class TestIndicatorsEdgeCases:
         try:
             result = indicators.calculate_bollinger_bands(df, period=10)
             assert isinstance(result, dict)
-            if result.get('bb_upper') and result.get('bb_lower'):
-                # With zero volatility, upper and lower bands should be close to middle
-                assert abs(result['bb_upper'] - result['bb_lower']) < 1
+            # With zero volatility, all three bands collapse onto the price
+            for band in ('bb_upper', 'bb_middle', 'bb_lower'):
+                assert result[band].iloc[-1] == pytest.approx(100.0)
         except Exception as e:
             assert False, f"Bollinger Bands crashed with zero volatility: {e}"
     
@@ -847,7 +821,7 @@ class TestIndicatorsEdgeCases:
             'high': [p * 1.01 for p in large_prices],
             'low': [p * 0.99 for p in large_prices],
             'volume': [1000] * len(large_prices),
-            'timestamp': pd.date_range('2023-01-01', periods=len(large_prices))
+            'timestamp': _DATES[:len(large_prices)]
         })
         
         # Should handle very large numbers without overflow
@@ -865,7 +839,7 @@ class TestIndicatorsEdgeCases:
             'high': [p * 1.01 for p in small_prices],
             'low': [p * 0.99 for p in small_prices],
             'volume': [1000] * len(small_prices),
-            'timestamp': pd.date_range('2023-01-01', periods=len(small_prices))
+            'timestamp': _DATES[:len(small_prices)]
         })
         
         # Should handle very small numbers without underflow
@@ -876,10 +850,11 @@ class TestIndicatorsEdgeCases:
             assert False, f"RSI crashed with very small numbers: {e}"
 
 
+@pytest.mark.usefixtures("pandas_ta_backend")
 class TestIndicatorsExceptionHandling:
     """Test exception handling in technical indicators"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def indicators(self):
         return TechnicalIndicators()
     
@@ -891,7 +866,7 @@ class TestIndicatorsExceptionHandling:
         
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 5,
-            'timestamp': pd.date_range('2023-01-01', periods=25)
+            'timestamp': _DATES[:25]
         })
         
         result = indicators.calculate_rsi(df, period=14)
@@ -908,7 +883,7 @@ class TestIndicatorsExceptionHandling:
         
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 5,
-            'timestamp': pd.date_range('2023-01-01', periods=25)
+            'timestamp': _DATES[:25]
         })
         
         result = indicators.calculate_rsi(df, period=14)
@@ -924,7 +899,7 @@ class TestIndicatorsExceptionHandling:
         
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 10,
-            'timestamp': pd.date_range('2023-01-01', periods=50)
+            'timestamp': _DATES[:50]
         })
         
         result = indicators.calculate_macd(df)
@@ -936,15 +911,15 @@ class TestIndicatorsExceptionHandling:
         assert result['histogram'] is None
         mock_macd.assert_called_once()
     
-    @patch('pandas_ta.sma')
+    @patch('src.indicators._sma_pair')
     def test_moving_averages_exception(self, mock_sma, indicators):
         """Test moving averages calculation exception handling"""
-        # Mock pandas_ta.sma to raise an exception
-        mock_sma.side_effect = Exception("pandas_ta SMA calculation failed")
+        # Mock the fused SMA kernel to raise an exception
+        mock_sma.side_effect = Exception("SMA calculation failed")
         
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 50,
-            'timestamp': pd.date_range('2023-01-01', periods=250)
+            'timestamp': _DATES[:250]
         })
         
         result = indicators.calculate_moving_averages(df, 50, 200)
@@ -961,7 +936,7 @@ class TestIndicatorsExceptionHandling:
         
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 50,
-            'timestamp': pd.date_range('2023-01-01', periods=250)
+            'timestamp': _DATES[:250]
         })
         
         result = indicators.calculate_ema(df, [20, 50, 200])
@@ -975,7 +950,7 @@ class TestIndicatorsExceptionHandling:
         # Create DataFrame with insufficient data for MA200
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 20,  # Only 100 periods
-            'timestamp': pd.date_range('2023-01-01', periods=100)
+            'timestamp': _DATES[:100]
         })
         
         result = indicators.calculate_moving_averages(df, 50, 200)  # Needs 200 periods
@@ -988,7 +963,7 @@ class TestIndicatorsExceptionHandling:
         # Create DataFrame with insufficient data for EMA200
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 20,  # Only 100 periods
-            'timestamp': pd.date_range('2023-01-01', periods=100)
+            'timestamp': _DATES[:100]
         })
         
         result = indicators.calculate_ema(df, [20, 50, 200])  # Needs 200 periods
@@ -1004,7 +979,7 @@ class TestIndicatorsExceptionHandling:
         
         df = pd.DataFrame({
             'close': [100, 101, 102, 103, 104] * 10,
-            'timestamp': pd.date_range('2023-01-01', periods=50)
+            'timestamp': _DATES[:50]
         })
         
         result = indicators.calculate_bollinger_bands(df)
@@ -1026,7 +1001,7 @@ class TestIndicatorsExceptionHandling:
             'high': [101, 102, 103, 104, 105] * 10,
             'low': [99, 100, 101, 102, 103] * 10,
             'close': [100, 101, 102, 103, 104] * 10,
-            'timestamp': pd.date_range('2023-01-01', periods=50)
+            'timestamp': _DATES[:50]
         })
         
         result = indicators.calculate_stochastic(df)
@@ -1050,7 +1025,7 @@ class TestIndicatorsExceptionHandling:
             'low': [99, 100, 101, 102, 103] * 10,
             'close': [100, 101, 102, 103, 104] * 10,
             'volume': [1000, 1100, 1200, 1300, 1400] * 10,
-            'timestamp': pd.date_range('2023-01-01', periods=50)
+            'timestamp': _DATES[:50]
         })
         
         result = indicators.calculate_volume_indicators(df)
@@ -1066,7 +1041,7 @@ class TestIndicatorsExceptionHandling:
             'high': [101, 102, 103],
             'low': [99, 100, 101],
             'close': [100, 101, 102],
-            'timestamp': pd.date_range('2023-01-01', periods=3)
+            'timestamp': _DATES[:3]
         })
         
         result = indicators.calculate_support_resistance(df, window=20)  # Needs 20 periods
@@ -1075,3 +1050,78 @@ class TestIndicatorsExceptionHandling:
         assert isinstance(result, dict)
         assert 'support' in result
         assert 'resistance' in result
+
+
+class TestTalibBackend:
+    """Test the TA-Lib fast path (skipped unless the optional TA-Lib package is installed)"""
+    
+    @pytest.fixture
+    def talib(self):
+        return pytest.importorskip("talib")
+    
+    @pytest.fixture(scope="class")
+    def indicators(self):
+        return TechnicalIndicators()
+    
+    @pytest.fixture(scope="class")
+    def price_data(self):
+        dates = _DATES[:60]
+        return pd.DataFrame({'close': np.linspace(100, 160, 60)}, index=dates)
+    
+    def test_rsi_uses_talib(self, talib, indicators, price_data):
+        """Test RSI is computed by talib.RSI on a float64 array"""
+        values = np.full(len(price_data), 55.0)
+        with patch.object(talib, 'RSI', return_value=values) as mock_rsi:
+            result = indicators.calculate_rsi(price_data, period=14)
+        
+        assert result == 55.0
+        mock_rsi.assert_called_once()
+        assert mock_rsi.call_args.args[0].dtype == np.float64
+        assert mock_rsi.call_args.kwargs['timeperiod'] == 14
+    
+    def test_macd_uses_talib(self, talib, indicators, price_data):
+        """Test MACD lines come from talib.MACD, aligned to the price index"""
+        n = len(price_data)
+        with patch.object(talib, 'MACD', return_value=(np.full(n, 1.0), np.full(n, 0.5), np.full(n, 0.5))):
+            result = indicators.calculate_macd(price_data)
+        
+        assert result['macd'].iloc[-1] == 1.0
+        assert result['signal'].iloc[-1] == 0.5
+        assert result['histogram'].iloc[-1] == 0.5
+        assert result['macd'].index.equals(price_data.index)
+    
+    def test_rsi_and_macd_match_pandas_ta(self, talib, indicators, monkeypatch):
+        """Test both backends give the same latest RSI and MACD lines on a fetched-size (350 bar) price walk"""
+        rng = np.random.default_rng(42)
+        close = 45000 * np.concatenate(([1.0], np.cumprod(1 + rng.normal(0, 0.02, 349))))
+        df = pd.DataFrame({'close': close}, index=_DATES[:350])
+        talib_rsi = indicators.calculate_rsi(df)
+        talib_macd = indicators.calculate_macd(df)
+        
+        # pandas-ta delegates to TA-Lib when it can import it; force its own code, as on a host without TA-Lib
+        ta = pytest.importorskip("pandas_ta")
+        monkeypatch.setattr('src.indicators.talib', None)
+        monkeypatch.setitem(ta.Imports, 'talib', False)
+        pandas_rsi = indicators.calculate_rsi(df)
+        pandas_macd = indicators.calculate_macd(df)
+        
+        # The backends seed their smoothing differently; by 350 bars the gap has decayed far below these tolerances
+        assert pandas_rsi == pytest.approx(talib_rsi, abs=1e-6)
+        for line in ('macd', 'signal', 'histogram'):
+            assert pandas_macd[line].iloc[-1] == pytest.approx(talib_macd[line].iloc[-1], abs=1e-6)
+    
+    def test_moving_averages_skip_talib(self, talib, indicators, price_data):
+        """Test gap-free moving averages come from the fused kernel, not talib.SMA"""
+        with patch.object(talib, 'SMA', wraps=talib.SMA) as mock_sma:
+            result = indicators.calculate_moving_averages(price_data, 10, 50)
+        
+        mock_sma.assert_not_called()
+        assert result['ma_short'].iloc[-1] == pytest.approx(price_data['close'].iloc[-10:].mean())
+        assert result['ma_long'].iloc[-1] == pytest.approx(price_data['close'].iloc[-50:].mean())
+    
+    def test_bollinger_bands_use_talib(self, talib, indicators, price_data):
+        """Test Bollinger Bands come from talib.BBANDS"""
+        result = indicators.calculate_bollinger_bands(price_data, period=20)
+        
+        assert result['bb_middle'].iloc[-1] == pytest.approx(price_data['close'].iloc[-20:].mean())
+        assert result['bb_upper'].iloc[-1] > result['bb_middle'].iloc[-1] > result['bb_lower'].iloc[-1]
@@ -9,25 +9,22 @@ import pandas as pd
 import numpy as np
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.data_fetcher import DataFetcher
 from src.strategy import AlertStrategy
 from src.indicators import TechnicalIndicators
 
 
+@pytest.fixture(scope="module")
+def data_fetcher():
+    """Shared fetcher; every test patches the fetcher methods it exercises, so no HTTP state leaks"""
+    return DataFetcher(retry_attempts=1, retry_delay=0.1)
+
+
 @pytest.mark.unit
 class TestMarketCrashScenarios:
     """Test system behavior during market crash scenarios"""
     
-    @pytest.fixture
-    def data_fetcher(self):
-        return DataFetcher(retry_attempts=1, retry_delay=0.1)
-    
     @pytest.fixture
     def strategy(self, mock_strategy_config):
         return AlertStrategy(mock_strategy_config)
@@ -140,10 +137,6 @@ class TestMarketCrashScenarios:
 class TestBullMarketScenarios:
     """Test system behavior during bull market scenarios"""
     
-    @pytest.fixture
-    def data_fetcher(self):
-        return DataFetcher(retry_attempts=1, retry_delay=0.1)
-    
     @pytest.mark.parametrize("bull_phase,btc_change,eth_change,fear_greed,btc_dominance", [
         ("early_bull", 8.5, 12.2, 65, 45.2),
         ("mid_bull", 15.2, 22.8, 75, 42.8),
@@ -278,10 +271,6 @@ class TestBullMarketScenarios:
 class TestSidewaysMarketScenarios:
     """Test system behavior during sideways/consolidation market scenarios"""
     
-    @pytest.fixture
-    def data_fetcher(self):
-        return DataFetcher(retry_attempts=1, retry_delay=0.1)
-    
     @pytest.mark.parametrize("consolidation_type,btc_change,eth_change,fear_greed,volatility", [
         ("tight_range", 2.1, -1.5, 45, "low"),
         ("wide_range", -5.2, 6.8, 52, "medium"),
@@ -415,10 +404,6 @@ class TestSidewaysMarketScenarios:
 class TestAltseasonScenarios:
     """Test altseason detection and behavior"""
     
-    @pytest.fixture
-    def data_fetcher(self):
-        return DataFetcher(retry_attempts=1, retry_delay=0.1)
-    
     def test_altseason_detection_logic(self, data_fetcher):
         """Test detection of altseason conditions"""
         altseason_data = {
@@ -493,10 +478,6 @@ class TestAltseasonScenarios:
 class TestMarketScenarioIntegration:
     """Integration tests combining multiple market scenarios"""
     
-    @pytest.fixture
-    def data_fetcher(self):
-        return DataFetcher(retry_attempts=1, retry_delay=0.1)
-    
     def test_market_cycle_transitions(self, data_fetcher, realistic_market_scenarios):
         """Test transitions between different market phases"""
         
@@ -9,11 +9,6 @@ import pandas as pd
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.strategic_advisor import StrategicAdvisor
 
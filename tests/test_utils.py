@@ -5,14 +5,10 @@ Tests for utility functions
 import pytest
 import unittest.mock as mock
 import os
-import sys
 import tempfile
 import yaml
 from datetime import datetime, timedelta
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from src.utils import (
     load_config, validate_config, setup_logging,
     format_percentage, format_currency,